@@ -1,68 +1,161 @@
 import json
 import logging
 import os
+from pathlib import Path
 import sys
+from types import MappingProxyType
 
-import ui.OnboardingWindow
 from ui.UIUtils import get_resource_path
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, falls back to the stdlib json module
+    orjson = None
 
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+else:
+    # json.loads without arguments already reuses the module's shared decoder
+    _loads = json.loads
+    # json.dumps builds a new encoder whenever options are passed, so keep one around.
+    # Matches orjson's OPT_INDENT_2 output, so config.json looks the same whichever path wrote it.
+    _ENCODE = json.JSONEncoder(indent=2, ensure_ascii=False).encode
+
+    def _dumps(obj):
+        return _ENCODE(obj).encode("utf-8")
+
+# Parsed JSON files keyed by path -> ((st_mtime_ns, st_size), data)
+_JSON_CACHE = {}
+# Last bytes write_json put on disk, keyed by path -> ((st_mtime_ns, st_size), payload)
+_WRITTEN = {}
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_json(path):
+    """
+    Read and parse a JSON file, reusing the cached result while the file is unchanged on disk.
+    Returns None for an empty file; raises FileNotFoundError if the file does not exist.
+    """
+    stamp = _stamp(path)
+    cached = _JSON_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with open(path, "rb") as f:
+        content = f.read()
+    data = _loads(content) if content else None
+    _JSON_CACHE[path] = (stamp, data)
+    return data
+
+
+def invalidate(path, data=None):
+    """
+    Drop the cached entry for path, or refresh it in place with data after a write.
+    """
+    if data is None:
+        _JSON_CACHE.pop(path, None)
+        return
+    try:
+        stamp = _stamp(path)
+    except OSError:
+        _JSON_CACHE.pop(path, None)
+        return
+    _JSON_CACHE[path] = (stamp, data)
+
+
+def write_json(path, data):
+    """
+    Serialize data to path as indented JSON and refresh the read cache.
+    The file is written to a temporary sibling first and swapped in, so a crash never leaves it truncated.
+    The write is skipped when the file still holds exactly what the previous call wrote.
+    """
+    payload = _dumps(data)
+    written = _WRITTEN.get(path)
+    if written is not None and written[1] == payload:
+        try:
+            unchanged = _stamp(path) == written[0]
+        except OSError:
+            unchanged = False
+        if unchanged:
+            invalidate(path, data)
+            return
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    invalidate(path, data)
+    try:
+        _WRITTEN[path] = (_stamp(path), payload)
+    except OSError:
+        _WRITTEN.pop(path, None)
 
 
 class ConfigManager:
     """Handles configuration and options loading/saving"""
 
+    __slots__ = ("app", "config", "options", "config_dir", "config_path", "options_path")
+
     def __init__(self, app):
         self.app = app
         self.config = None
         self.options = None
-        self.config_path = None
+        # Resolved once: sys.argv[0] may be relative, and a later chdir would otherwise move the config
+        self.config_dir = Path(os.path.abspath(sys.argv[0])).parent
+        self.config_path = str(self.config_dir / "config.json")
         self.options_path = None
 
     def load_config(self):
         """
         Load the configuration file.
         """
-        self.config_path = os.path.join(os.path.dirname(sys.argv[0]), "config.json")
-        logging.debug(f"Loading config from {self.config_path}")
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path) as f:
-                    content = f.read().strip()
-                    if content:
-                        self.config = json.loads(content)
-                        logging.debug("Config loaded successfully")
-                    else:
-                        logging.debug("Config file is empty")
-                        self.config = None
-            except (json.JSONDecodeError, IOError) as e:
-                logging.warning(f"Config file is corrupted or unreadable: {e}")
-                self.config = None
-        else:
+        logging.debug("Loading config from %s", self.config_path)
+        try:
+            self.config = _read_json(self.config_path)
+        except FileNotFoundError:
             logging.debug("Config file not found")
             self.config = None
+            return
+        except (json.JSONDecodeError, IOError) as e:
+            logging.warning("Config file is corrupted or unreadable: %s", e)
+            self.config = None
+            return
+
+        if self.config is not None:
+            logging.debug("Config loaded successfully")
+        else:
+            logging.debug("Config file is empty")
 
     def load_options(self):
         """
         Load the options file.
         """
         self.options_path = get_resource_path("options.json")
-        logging.debug(f"Loading options from {self.options_path}")
-        if os.path.exists(self.options_path):
-            with open(self.options_path) as f:
-                self.options = json.load(f)
-                logging.debug("Options loaded successfully")
-        else:
+        logging.debug("Loading options from %s", self.options_path)
+        try:
+            options = _read_json(self.options_path)
+        except FileNotFoundError:
             logging.debug("Options file not found")
             self.options = None
+            return
+        # Read-only view: the parsed dict is shared through the read cache
+        self.options = MappingProxyType(options) if options is not None else None
+        logging.debug("Options loaded successfully")
 
     def save_config(self, config):
         """
         Save the configuration file.
         """
-        with open(self.config_path, "w") as f:
-            json.dump(config, f, indent=4)
-            logging.debug("Config saved successfully")
+        write_json(self.config_path, config)
+        logging.debug("Config saved successfully")
         self.config = config
 
     def show_onboarding(self):
@@ -70,6 +163,8 @@ class ConfigManager:
         Show the onboarding window for first-time users.
         """
         logging.debug("Showing onboarding window")
+        import ui.OnboardingWindow
+
         onboarding_window = ui.OnboardingWindow.OnboardingWindow(self.app)
         onboarding_window.close_signal.connect(self.app.exit_app)
         onboarding_window.show()
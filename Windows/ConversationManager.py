@@ -1,7 +1,20 @@
+from itertools import islice
 import logging
 import threading
 
-from PySide6.QtCore import QObject, Signal
+from ProviderInterfaces import DEFAULT_CHAT_SYSTEM_INSTRUCTION
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class _FollowupTask(QRunnable):
+    """Runs a follow-up request on the shared Qt thread pool"""
+
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+
+    def run(self):
+        self.fn()
 
 
 class ConversationManager(QObject):
@@ -13,47 +26,56 @@ class ConversationManager(QObject):
     def __init__(self, app, parent=None):
         super().__init__(parent)
         self.app = app
+        self.thread_pool = QThreadPool.globalInstance()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """
+        Discard the response of the follow-up question currently in flight.
+        """
+        self._cancel_event.set()
 
     def process_followup_question(self, response_window, question, model=None, thinking_budget=None):
         """
         Process a follow-up question in the chat window.
         """
-        logging.debug(f"Processing follow-up question: {question} with model: {model}, thinking: {thinking_budget}")
+        logging.debug(
+            "Processing follow-up question: %s with model: %s, thinking: %s", question, model, thinking_budget
+        )
+
+        # Fresh event per request so cancelling an old request can't affect a new one
+        cancel_event = threading.Event()
+        self._cancel_event = cancel_event
 
         def process_thread():
             logging.debug("Starting follow-up processing thread")
             try:
-                # Get current chat history using the message manager
-                chat_history = response_window.message_manager.get_chat_history()
-
                 # Add current question to chat history
                 response_window.message_manager.add_user_message(question)
 
-                # Get updated chat history
-                history = response_window.message_manager.get_chat_history().copy()
+                # Get updated chat history (only read, so no copy needed)
+                history = response_window.message_manager.get_chat_history()
 
                 # System instruction from user settings
                 system_instruction = getattr(
-                    self.app.current_provider,
-                    "chat_system_instruction",
-                    "You are a friendly, helpful, compassionate, and endearing AI conversational assistant. Avoid making assumptions or generating harmful, biased, or inappropriate content. When in doubt, do not make up information. Ask the user for clarification if needed. Try not be unnecessarily repetitive in your response. You can, and should as appropriate, use Markdown formatting to make your response nicely readable.",
+                    self.app.current_provider, "chat_system_instruction", DEFAULT_CHAT_SYSTEM_INSTRUCTION
                 )
 
                 logging.debug("Sending request to AI provider")
 
                 # Format conversation for new Google genai client
                 # Build conversation context from history
-                conversation_text = system_instruction + "\n\n"
+                parts = [system_instruction, "\n\n"]
 
                 # Only add previous conversation if there is any
                 if len(history) > 1:  # More than just the current question
-                    for msg in history[:-1]:  # Exclude the current question
-                        if msg["role"] == "user":
-                            conversation_text += f"User: {msg['content']}\n\n"
-                        else:
-                            conversation_text += f"Assistant: {msg['content']}\n\n"
+                    for msg in islice(history, len(history) - 1):  # Exclude the current question
+                        parts.append("User: " if msg["role"] == "user" else "Assistant: ")
+                        parts.append(msg["content"])
+                        parts.append("\n\n")
 
-                conversation_text += f"User: {question}\n\nAssistant:"
+                parts.extend(("User: ", question, "\n\nAssistant:"))
+                conversation_text = "".join(parts)
 
                 # Use the provider's get_response method with return_response=True
                 response_text = self.app.current_provider.get_response(
@@ -64,7 +86,16 @@ class ConversationManager(QObject):
                     thinking_budget=thinking_budget,
                 )
 
-                logging.debug(f"Got response of length: {len(response_text)}")
+                logging.debug("Got response of length: %d", len(response_text))
+
+                if cancel_event.is_set():
+                    logging.debug("Follow-up question was cancelled, discarding response")
+                    # Drop the unanswered question so the next request isn't built on it
+                    if history and history[-1]["role"] == "user" and history[-1]["content"] == question:
+                        history.pop()
+                    # Empty response hides the loading indicator and re-enables the input without adding a message
+                    self.followup_response_signal.emit("")
+                    return
 
                 # Add response to chat history
                 response_window.message_manager.add_assistant_message(response_text)
@@ -73,7 +104,7 @@ class ConversationManager(QObject):
                 self.followup_response_signal.emit(response_text)
 
             except Exception as e:
-                logging.error(f"Error processing follow-up question: {e}", exc_info=True)
+                logging.error("Error processing follow-up question: %s", e, exc_info=True)
 
                 if "Resource has been exhausted" in str(e):
                     self.show_message_signal.emit(
@@ -85,5 +116,5 @@ class ConversationManager(QObject):
                     self.show_message_signal.emit("Error", f"An error occurred: {e}")
                     self.followup_response_signal.emit("Sorry, an error occurred while processing your question.")
 
-        # Start the thread
-        threading.Thread(target=process_thread, daemon=True).start()
\ No newline at end of file
+        # Run on the shared thread pool instead of spawning a thread per question
+        self.thread_pool.start(_FollowupTask(process_thread))
\ No newline at end of file
@@ -6,65 +6,291 @@ This module contains the GeminiProvider class that implements the AIProvider int
 for Google's Gemini API using the new genai.Client approach.
 """
 
-from datetime import datetime
+import atexit
+from datetime import date, datetime, timedelta
+import functools
 import logging
+import re
+import threading
 import webbrowser
 import time
 import random
 
 # External libraries
-from google import genai
-from google.genai import types
 from PySide6.QtWidgets import QVBoxLayout
 
-from ProviderInterfaces import AIProvider
+from ProviderInterfaces import DEFAULT_CHAT_SYSTEM_INSTRUCTION, AIProvider
 from ProviderUI import TextSetting, DropdownSetting
 
+# google-genai pulls in a large dependency tree, so it is imported on first use
+_genai = None
+_types = None
+
+
+def _load_genai():
+    """
+    Import the google-genai SDK once and return (genai, types).
+    """
+    global _genai, _types
+    if _genai is None:
+        from google import genai
+        from google.genai import types
+
+        _genai, _types = genai, types
+    return _genai, _types
+
+
+# genai.Client instances keyed by API key, shared across config reloads and provider instances
+_CLIENT_CACHE = {}
+
+# Hotkey requests are often minutes apart; httpx's default 5s keep-alive would redo the TLS handshake for each one
+_KEEPALIVE_SECONDS = 120
+# Single request timeout, enforced by the SDK's transport. Replies arrive all at once, so this has to
+# cover a full thinking-model generation.
+_REQUEST_TIMEOUT_MS = 180_000
+
+
+def _http_client_args():
+    """
+    httpx.Client arguments for the SDK's sync connection pool: a long keep-alive, plus HTTP/2 when h2 is installed.
+    """
+    import httpx  # Always installed alongside google-genai
+
+    args = {"limits": httpx.Limits(max_keepalive_connections=4, keepalive_expiry=_KEEPALIVE_SECONDS)}
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        args["http2"] = True
+    return args
+
+
+def _get_client(api_key):
+    """
+    Return the genai.Client for api_key, creating it on first use.
+    """
+    client = _CLIENT_CACHE.get(api_key)
+    if client is None:
+        genai, types = _load_genai()
+        try:
+            client_args = _http_client_args()
+            # Sync client only: with aiohttp installed, the SDK hands async_client_args to aiohttp instead
+            http_options = types.HttpOptions(timeout=_REQUEST_TIMEOUT_MS, client_args=client_args)
+            new_client = genai.Client(api_key=api_key, http_options=http_options)
+        except (TypeError, ValueError) as e:
+            # SDK versions before client_args was added reject it; fall back to the default transport
+            logging.debug("Custom HTTP options unsupported, using defaults: %s", e)
+            new_client = genai.Client(api_key=api_key)
+        client = _CLIENT_CACHE.setdefault(api_key, new_client)
+    return client
+
+
+@atexit.register
+def _close_clients():
+    """
+    Close the cached clients' HTTP sessions on exit (older SDK versions have no close()).
+    """
+    for client in _CLIENT_CACHE.values():
+        close = getattr(client, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception as e:
+                logging.debug("Error closing genai.Client: %s", e)
+    _CLIENT_CACHE.clear()
+
+
+# API error keywords in priority order: (group name, pattern, user-facing message with {error} as the raw text)
+_ERROR_RULES = (
+    ("timeout", "timeout|time out", "Request timed out. Please try again."),
+    ("safety", "safety|blocked", "Content was blocked by safety filters. Try rephrasing your request."),
+    (
+        "rate",
+        "rate|quota|limit",
+        "Rate limit reached. The app tried multiple times but couldn't get through. Please wait a moment and try again.",
+    ),
+    ("notfound", "not found|invalid", "Model error: {error}"),
+    ("auth", "authentication|api key|unauthorized", "Authentication failed. Please check your API key in settings."),
+    ("unavail", "service unavailable|server error", "Gemini service temporarily unavailable. Please try again in a moment."),
+)
+
+# One compiled pattern for all rules. Each alternative is an anchored lookahead, so the alternatives are tried in
+# rule order and the first rule whose keyword appears anywhere wins (a plain alternation would pick whichever
+# keyword occurs first in the text instead). lastgroup names the matching rule.
+_ERROR_RE = re.compile(
+    "|".join(f"^(?=.*?(?P<{name}>{pattern}))" for name, pattern, _ in _ERROR_RULES), re.IGNORECASE | re.DOTALL
+)
+_ERROR_MESSAGES = {name: message for name, _, message in _ERROR_RULES}
+
+
+def _classify_error(error_str):
+    """
+    Map a raw API error string to a user-facing error message.
+    """
+    match = _ERROR_RE.match(error_str)
+    if match:
+        return _ERROR_MESSAGES[match.lastgroup].format(error=error_str)
+    return f"Gemini API Error: {error_str}"
+
+
+# Exception type -> message (or None to classify by text), resolved once per concrete type
+_EXCEPTION_MESSAGES = {}
+
+
+def _messages_by_base_type():
+    """
+    Transport exception base classes whose message doesn't depend on the error text.
+    """
+    import httpx  # Always installed alongside google-genai
+
+    return (
+        (TimeoutError, _ERROR_MESSAGES["timeout"]),
+        (httpx.TimeoutException, _ERROR_MESSAGES["timeout"]),
+        (httpx.ConnectError, "Could not connect to Gemini. Please check your internet connection and try again."),
+    )
+
+
+def _classify_exception(e):
+    """
+    Map an API exception to a user-facing error message, by type where possible and by its text otherwise.
+    """
+    exc_type = type(e)
+    try:
+        message = _EXCEPTION_MESSAGES[exc_type]
+    except KeyError:
+        message = next((msg for base, msg in _messages_by_base_type() if issubclass(exc_type, base)), None)
+        _EXCEPTION_MESSAGES[exc_type] = message
+    return message if message is not None else _classify_error(str(e))
+
+
+# [timestamp of next local midnight, today's date as YYYY-MM-DD]
+_DATE_CACHE = [0.0, ""]
+
+
+def _today():
+    """
+    Return today's date as YYYY-MM-DD, only recomputing it once the day rolls over.
+    """
+    now = time.time()
+    if now >= _DATE_CACHE[0]:
+        today = date.today()
+        next_midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        _DATE_CACHE[:] = [next_midnight.timestamp(), today.isoformat()]
+    return _DATE_CACHE[1]
+
+
+@functools.lru_cache(maxsize=16)
+def _system_prefix(model, thinking_budget, date_str):
+    """
+    Build the date/model/thinking-mode header that is prepended to every system instruction.
+    """
+    thinking_mode = (
+        "no thinking"
+        if thinking_budget == 0
+        else ("dynamic thinking" if thinking_budget == -1 else f"thinking budget: {thinking_budget}")
+    )
+    return f"Today's date is {date_str}. You are running on {model} with {thinking_mode}."
+
+
+@functools.lru_cache(maxsize=16)
+def _make_config(system_instruction, cached_content, thinking_budget):
+    """
+    Build (once per combination) the GenerateContentConfig for a request. The SDK only reads it, so it is shared.
+    Exactly one of system_instruction and cached_content is set.
+    """
+    _, types = _load_genai()
+    thinking_config = types.ThinkingConfig(thinking_budget=thinking_budget)
+    if cached_content:
+        return types.GenerateContentConfig(cached_content=cached_content, thinking_config=thinking_config)
+    return types.GenerateContentConfig(system_instruction=system_instruction, thinking_config=thinking_config)
+
+
+# Explicit context caches need roughly 1024+ input tokens, so shorter system instructions are sent inline
+_MIN_CACHED_INSTRUCTION_CHARS = 4096
+_CACHE_TTL_SECONDS = 600
+
+DEFAULT_CHAT_MODEL = "gemini-2.5-flash"
+DEFAULT_TEXT_MODEL = "gemini-2.5-flash-lite"
+
+_MODEL_OPTIONS = (
+    ("Gemini 2.5 Flash (most intelligent | fast | 10 uses/min)", "gemini-2.5-flash"),
+    ("Gemini 2.5 Flash Lite (faster | lightweight | 15 uses/min)", "gemini-2.5-flash-lite"),
+)
+
+# Settings schema, built once at import. Each provider instance creates its own
+# setting objects from it since those hold per-instance widget state.
+_GEMINI_SETTINGS_SPEC = (
+    (
+        TextSetting,
+        dict(name="api_key", display_name="API Key", description="Paste your Gemini API key here", secret=True),
+    ),
+    (
+        DropdownSetting,
+        dict(
+            name="chat_model_name",
+            display_name="Chat Model",
+            default_value=DEFAULT_CHAT_MODEL,
+            description="Model for chat conversations and follow-up questions",
+            options=_MODEL_OPTIONS,
+        ),
+    ),
+    (
+        DropdownSetting,
+        dict(
+            name="text_model_name",
+            display_name="Text Operations Model",
+            default_value=DEFAULT_TEXT_MODEL,
+            description="Model for text operations (Proofread, Rewrite, etc.)",
+            options=_MODEL_OPTIONS,
+        ),
+    ),
+    (
+        TextSetting,
+        dict(
+            name="chat_system_instruction",
+            display_name="Chat System Instruction",
+            default_value=DEFAULT_CHAT_SYSTEM_INSTRUCTION,
+            description="System instruction for custom chat and follow-up questions (does not affect text operations like Proofread, Rewrite, etc.)",
+        ),
+    ),
+)
+
 
 class GeminiProvider(AIProvider):
     """
     Provider for Google's Gemini API using the new genai.Client approach.
     """
 
+    # Includes one slot per setting, since load_config assigns every setting as an attribute
+    __slots__ = (
+        "_in_flight",
+        "_in_flight_lock",
+        "client",
+        "_client_api_key",
+        "_cache_by_key",
+        "api_key",
+        "chat_model_name",
+        "text_model_name",
+        "chat_system_instruction",
+    )
+
     def __init__(self, app):
-        self.close_requested = False
+        # Setting defaults until load_config runs, so reads never need a getattr fallback
+        self.api_key = ""
+        self.chat_model_name = DEFAULT_CHAT_MODEL
+        self.text_model_name = DEFAULT_TEXT_MODEL
+        self.chat_system_instruction = DEFAULT_CHAT_SYSTEM_INSTRUCTION
+
+        # Cancel events of the requests currently running; each request owns its own, so starting a new
+        # request can never un-cancel an older one
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
         self.client = None
+        self._client_api_key = None  # API key the current client was created with
+        self._cache_by_key = {}  # (model, system instruction) -> (cached content name or None, expiry)
 
-        settings = [
-            TextSetting(name="api_key", display_name="API Key", description="Paste your Gemini API key here"),
-            DropdownSetting(
-                name="chat_model_name",
-                display_name="Chat Model",
-                default_value="gemini-2.5-flash",
-                description="Model for chat conversations and follow-up questions",
-                options=[
-                    ("Gemini 2.5 Flash (most intelligent | fast | 10 uses/min)", "gemini-2.5-flash"),
-                    (
-                        "Gemini 2.5 Flash Lite (faster | lightweight | 15 uses/min)",
-                        "gemini-2.5-flash-lite",
-                    ),
-                ],
-            ),
-            DropdownSetting(
-                name="text_model_name",
-                display_name="Text Operations Model",
-                default_value="gemini-2.5-flash-lite",
-                description="Model for text operations (Proofread, Rewrite, etc.)",
-                options=[
-                    ("Gemini 2.5 Flash (most intelligent | fast | 10 uses/min)", "gemini-2.5-flash"),
-                    (
-                        "Gemini 2.5 Flash Lite (faster | lightweight | 15 uses/min)",
-                        "gemini-2.5-flash-lite",
-                    ),
-                ],
-            ),
-            TextSetting(
-                name="chat_system_instruction",
-                display_name="Chat System Instruction",
-                default_value="You are a friendly, helpful, compassionate, and endearing AI conversational assistant. Avoid making assumptions or generating harmful, biased, or inappropriate content. When in doubt, do not make up information. Ask the user for clarification if needed. Try not be unnecessarily repetitive in your response. You can, and should as appropriate, use Markdown formatting to make your response nicely readable.",
-                description="System instruction for custom chat and follow-up questions (does not affect text operations like Proofread, Rewrite, etc.)",
-            ),
-        ]
+        settings = [setting_cls(**kwargs) for setting_cls, kwargs in _GEMINI_SETTINGS_SPEC]
         super().__init__(
             app,
             "Gemini",
@@ -91,13 +317,48 @@ class GeminiProvider(AIProvider):
                 if ("rate" in error_str or "quota" in error_str or "limit" in error_str) and attempt < max_retries - 1:
                     # Exponential backoff: 1s, 2s, 4s + random jitter
                     delay = (2 ** attempt) + random.uniform(0, 1)
-                    logging.warning(f"Rate limit detected, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+                    logging.warning(
+                        "Rate limit detected, retrying in %.1fs (attempt %d/%d)", delay, attempt + 1, max_retries
+                    )
                     time.sleep(delay)
                     continue
                 
                 # Re-raise for non-rate-limit errors or final attempt
                 raise e
 
+    def _cached_instruction(self, model, system_instruction):
+        """
+        Return the name of a context cache holding system_instruction for model, creating it if needed.
+        Returns None when the instruction should be sent inline instead (too short, or caching failed).
+        """
+        if len(system_instruction) < _MIN_CACHED_INSTRUCTION_CHARS:
+            return None
+
+        key = (model, system_instruction)
+        now = time.monotonic()
+        entry = self._cache_by_key.get(key)
+        if entry is not None and now < entry[1]:
+            return entry[0]
+
+        _, types = _load_genai()
+        try:
+            cached = self.client.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=system_instruction, ttl=f"{_CACHE_TTL_SECONDS}s"
+                ),
+            )
+            name = cached.name
+            logging.debug("Created context cache %s for %s", name, model)
+        except Exception as e:
+            # Failures are remembered until the TTL passes so every request doesn't retry the create call
+            logging.debug("Context caching unavailable for %s: %s", model, e)
+            name = None
+
+        # Expire a little early so requests never reference a cache the server has already dropped
+        self._cache_by_key[key] = (name, now + _CACHE_TTL_SECONDS - 30)
+        return name
+
     def get_response(
         self,
         system_instruction: str,
@@ -117,9 +378,11 @@ class GeminiProvider(AIProvider):
             model: Override the default model (e.g., "gemini-2.5-flash")
             thinking_budget: Override the default thinking budget (0=no thinking, -1=dynamic, >0=specific amount)
         """
-        logging.debug(f"Getting response - API key available: {hasattr(self, 'api_key') and bool(self.api_key)}")
+        logging.debug("Getting response - API key available: %s", bool(self.api_key))
 
-        self.close_requested = False
+        cancel_event = threading.Event()
+        with self._in_flight_lock:
+            self._in_flight.add(cancel_event)
 
         try:
             # Determine which model to use based on operation type
@@ -128,44 +391,58 @@ class GeminiProvider(AIProvider):
                 use_model = model
             elif return_response:
                 # Chat operations (return_response=True) use chat model
-                use_model = getattr(self, "chat_model_name", "gemini-2.5-flash")
+                use_model = self.chat_model_name
             else:
                 # Text operations (return_response=False) use text model
-                use_model = getattr(self, "text_model_name", "gemini-2.5-flash-lite")
+                use_model = self.text_model_name
+
+            if cancel_event.is_set():
+                logging.debug("Request cancelled before it was sent")
+                return ""
 
             # Use provided thinking budget or fall back to default (0 = no thinking)
             use_thinking = thinking_budget if thinking_budget is not None else 0
 
             # Debug logging
-            logging.debug(f"Making API call with model: {use_model}")
-            logging.debug(f"Using thinking budget: {use_thinking}")
-            logging.debug(f"System instruction length: {len(system_instruction)}")
-            logging.debug(f"Prompt length: {len(prompt)}")
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("Making API call with model: %s", use_model)
+                logging.debug("Using thinking budget: %s", use_thinking)
+                logging.debug("System instruction length: %d", len(system_instruction))
+                logging.debug("Prompt length: %d", len(prompt))
 
             # Add current date, model info, and thinking mode to system instruction
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            thinking_mode = (
-                "no thinking"
-                if use_thinking == 0
-                else ("dynamic thinking" if use_thinking == -1 else f"thinking budget: {use_thinking}")
-            )
-            enhanced_system_instruction = f"Today's date is {current_date}. You are running on {use_model} with {thinking_mode}. {system_instruction}"
+            prefix = _system_prefix(use_model, use_thinking, _today())
 
-            # Combine system instruction and prompt
-            full_prompt = f"{enhanced_system_instruction}\n\n{prompt}"
+            # Sent through the native system_instruction field so the prompt isn't copied into a combined string
+            enhanced_system_instruction = f"{prefix} {system_instruction}" if system_instruction else prefix
+
+            # Long system instructions (e.g. custom buttons) are stored once server-side and referenced by name
+            cache_name = self._cached_instruction(use_model, enhanced_system_instruction)
+            if cache_name:
+                config = _make_config(None, cache_name, use_thinking)
+            else:
+                config = _make_config(enhanced_system_instruction, None, use_thinking)
 
             # Generate content using the new genai.Client approach with exponential backoff
             def make_api_call():
-                return self.client.models.generate_content(
-                    model=use_model,
-                    contents=full_prompt,
-                    config=types.GenerateContentConfig(thinking_config=types.ThinkingConfig(thinking_budget=use_thinking)),
-                )
-            
+                return self.client.models.generate_content(model=use_model, contents=prompt, config=config)
+
+            # Setting up the cache may have taken a round-trip, so check again right before sending
+            if cancel_event.is_set():
+                logging.debug("Request cancelled before it was sent")
+                return ""
+
             response = self._exponential_backoff_retry(make_api_call)
-            response_text = response.text.rstrip("\n")
+            response_text = response.text
+            if response_text.endswith("\n"):
+                response_text = response_text.rstrip("\n")
             logging.debug("API call completed successfully")
 
+            # A response to a request cancelled mid-flight must not be pasted over the user's new selection
+            if cancel_event.is_set():
+                logging.debug("Request cancelled while in flight, discarding response")
+                return ""
+
             if not return_response:
                 # For direct text replacement operations, call replace_text directly
                 self.app.text_operations_manager.replace_text(response_text)
@@ -174,33 +451,16 @@ class GeminiProvider(AIProvider):
 
         except Exception as e:
             # Handle various error types
-            logging.error(f"Gemini API exception: {type(e).__name__}: {str(e)}")
-
-            error_str = str(e).lower()
-            if "timeout" in error_str or "time out" in error_str:
-                error_msg = "Request timed out. Please try again."
-            elif "safety" in error_str or "blocked" in error_str:
-                error_msg = "Content was blocked by safety filters. Try rephrasing your request."
-            elif "rate" in error_str or "quota" in error_str or "limit" in error_str:
-                error_msg = "Rate limit reached. The app tried multiple times but couldn't get through. Please wait a moment and try again."
-            elif "not found" in error_str or "invalid" in error_str:
-                error_msg = f"Model error: {str(e)}"
-            elif (
-                "authentication" in error_str
-                or "api key" in error_str
-                or "unauthorized" in error_str
-            ):
-                error_msg = "Authentication failed. Please check your API key in settings."
-            elif "service unavailable" in error_str or "server error" in error_str:
-                error_msg = "Gemini service temporarily unavailable. Please try again in a moment."
-            else:
-                error_msg = f"Gemini API Error: {str(e)}"
+            logging.error("Gemini API exception: %s: %s", type(e).__name__, e)
+
+            error_msg = _classify_exception(e)
 
-            logging.error(f"Processed error message: {error_msg}")
+            logging.error("Processed error message: %s", error_msg)
             # For errors, show message via signal
             self.app.show_message_signal.emit("Error", error_msg)
         finally:
-            self.close_requested = False
+            with self._in_flight_lock:
+                self._in_flight.discard(cancel_event)
 
         return ""
 
@@ -208,34 +468,49 @@ class GeminiProvider(AIProvider):
         """
         Initialize the genai.Client after configuration is loaded.
         """
-        logging.debug(
-            f"Configuring Gemini with API key: {'***' + str(getattr(self, 'api_key', 'NOT SET'))[-4:] if hasattr(self, 'api_key') and self.api_key else 'NOT SET'}"
-        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            api_key = self.api_key
+            logging.debug("Configuring Gemini with API key: %s", "***" + str(api_key)[-4:] if api_key else "NOT SET")
 
-        if not hasattr(self, "api_key") or not self.api_key:
+        if not self.api_key:
             logging.error("No API key found in Gemini provider")
             return
 
-        # Create the genai.Client with the API key
-        self.client = genai.Client(api_key=self.api_key)
+        # Keep the existing client (and its connection pool) when only non-auth settings changed
+        if self.client is not None and self._client_api_key == self.api_key:
+            logging.debug("API key unchanged, reusing existing genai.Client")
+            return
+
+        # Fetch the genai.Client for this API key, reusing one created by an earlier load
+        self.client = _get_client(self.api_key)
+        self._client_api_key = self.api_key
+        # Context caches belong to the previous key's project
+        self._cache_by_key.clear()
         logging.debug("Gemini provider configured with genai.Client")
 
     def before_load(self):
         """
         Clean up client before reloading configuration.
+        The client itself stays in the module cache, so reloading with the same key doesn't recreate it.
         """
         self.client = None
+        self._client_api_key = None
+        self._cache_by_key.clear()
 
     def cancel(self):
-        self.close_requested = True
+        """
+        Cancel every request currently in flight. Requests started afterwards are not affected.
+        """
+        with self._in_flight_lock:
+            for cancel_event in self._in_flight:
+                cancel_event.set()
 
     def get_settings_ui(self, parent) -> QVBoxLayout:
         """
         Return a layout containing the provider's settings UI.
         """
         layout = QVBoxLayout()
-        for setting in self.settings:
-            setting.render_to_layout(layout)
+        self.render_all(layout)
         return layout
 
     def save_settings(self, layout: QVBoxLayout):
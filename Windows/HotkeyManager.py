@@ -1,21 +1,40 @@
 import logging
-import os
 
 from pynput import keyboard as pykeyboard
-from PySide6 import QtCore, QtGui
+from PySide6 import QtCore
 from PySide6.QtCore import Signal, Slot, QObject
 
-import ui.CustomPopupWindow
-import ui.ResponseWindow
-from ui.UIUtils import get_resource_path
 
+def _to_pynput_shortcut(shortcut):
+    """
+    Convert a shortcut string to pynput's format, for example ctrl+alt+h -> <ctrl>+<alt>+h
+    """
+    return "+".join(t if len(t) <= 1 else f"<{t}>" for t in shortcut.split("+"))
 
 
+class _HotkeyListener(pykeyboard.Listener):
+    """
+    Keyboard listener that feeds canonicalized key events straight into a HotKey.
+    pynput calls this for every key press system-wide, so each event is kept to a single Python frame.
+    """
+
+    def __init__(self, hotkey):
+        self._hotkey_press = hotkey.press
+        self._hotkey_release = hotkey.release
+        super().__init__(on_press=self._feed_press, on_release=self._feed_release)
+
+    def _feed_press(self, key):
+        self._hotkey_press(self.canonical(key))
+
+    def _feed_release(self, key):
+        self._hotkey_release(self.canonical(key))
+
 
 class HotkeyManager(QObject):
     """Handles global hotkey registration and detection"""
     
     hotkey_triggered_signal = Signal()
+    _show_popup_signal = Signal()
 
     def __init__(self, app, parent=None):
         super().__init__(parent)
@@ -23,43 +42,45 @@ class HotkeyManager(QObject):
         self.hotkey_listener = None
         self.registered_hotkey = None
         self.popup_window = None
+        self._showing_popup = False  # True while _show_popup is capturing the selection
+        self._parsed_cache = {}  # shortcut string -> parsed pynput key list
         
         # Connect signals
         self.hotkey_triggered_signal.connect(self.on_hotkey_pressed)
+        # Queued so the popup opens on a fresh event loop pass, after the hotkey handler returns
+        self._show_popup_signal.connect(self._show_popup, QtCore.Qt.ConnectionType.QueuedConnection)
 
     def start_hotkey_listener(self):
         """
         Create listener for global hotkeys.
         """
         orig_shortcut = self.app.config.get("shortcut", "ctrl+space")
-        # Parse the shortcut string, for example ctrl+alt+h -> <ctrl>+<alt>+h
-        shortcut = "+".join([f"{t}" if len(t) <= 1 else f"<{t}>" for t in orig_shortcut.split("+")])
-        logging.debug(f"Registering global hotkey for shortcut: {shortcut}")
+        logging.debug("Registering global hotkey for shortcut: %s", orig_shortcut)
         try:
             if self.hotkey_listener is not None:
                 self.hotkey_listener.stop()
 
+            # Parse the shortcut only the first time it is registered
+            parsed_keys = self._parsed_cache.get(orig_shortcut)
+            if parsed_keys is None:
+                parsed_keys = pykeyboard.HotKey.parse(_to_pynput_shortcut(orig_shortcut))
+                self._parsed_cache[orig_shortcut] = parsed_keys
+
             def on_activate():
                 logging.debug("triggered hotkey")
                 self.hotkey_triggered_signal.emit()  # Emit the signal when hotkey is pressed
 
             # Define the hotkey combination
-            hotkey = pykeyboard.HotKey(pykeyboard.HotKey.parse(shortcut), on_activate)
+            hotkey = pykeyboard.HotKey(parsed_keys, on_activate)
             self.registered_hotkey = orig_shortcut
 
-            # Helper function to standardize key event
-            def for_canonical(f):
-                return lambda k: f(self.hotkey_listener.canonical(k))
-
             # Create a listener and store it as an attribute to stop it later
-            self.hotkey_listener = pykeyboard.Listener(
-                on_press=for_canonical(hotkey.press), on_release=for_canonical(hotkey.release)
-            )
+            self.hotkey_listener = _HotkeyListener(hotkey)
 
             # Start the listener
             self.hotkey_listener.start()
         except Exception as e:
-            logging.error(f"Failed to register hotkey: {e}")
+            logging.error("Failed to register hotkey: %s", e)
 
     def register_hotkey(self):
         """
@@ -86,27 +107,47 @@ class HotkeyManager(QObject):
         if self.app.current_provider:
             logging.debug("Cancelling current provider's request")
             self.app.current_provider.cancel()
+            self.app.conversation_manager.cancel()
             self.app.text_operations_manager.output_queue = ""
 
-        # noinspection PyTypeChecker
-        QtCore.QMetaObject.invokeMethod(self, "_show_popup", QtCore.Qt.ConnectionType.QueuedConnection)
+        self._show_popup_signal.emit()
 
     @Slot()
     def _show_popup(self):
         """
         Show the popup window when the hotkey is pressed.
         """
+        # A capture in progress has replaced the clipboard; a second one would back up that state
+        # instead of the user's clipboard, so ignore presses until it finishes
+        if self._showing_popup:
+            logging.debug("Popup already being shown, ignoring hotkey")
+            return
+        self._showing_popup = True
+        try:
+            self._capture_and_show_popup()
+        finally:
+            self._showing_popup = False
+
+    def _capture_and_show_popup(self):
+        """
+        Capture the selected text and open the popup for it, or the chat window if nothing is selected.
+        """
         logging.debug("Showing popup window")
         # First attempt with default sleep
         selected_text = self.app.text_operations_manager.get_selected_text()
 
-        # Retry with more attempts if no text captured
-        if not selected_text:
+        # Retry with more attempts if no text captured, unless Ctrl+C didn't touch the clipboard at all:
+        # then nothing is selected and the chat window can open right away
+        if not selected_text and self.app.text_operations_manager.last_capture_copied is not False:
             logging.debug("No text captured, retrying with more attempts")
             selected_text = self.app.text_operations_manager.get_selected_text(max_retries=3)
 
-        logging.debug(f'Selected text: "{selected_text}"')
+        logging.debug("Selected text length: %d", len(selected_text))
         try:
+            # Imported here so the popup/chat windows only load once the hotkey is used
+            import ui.CustomPopupWindow
+            import ui.ResponseWindow
+
             # Check if we have any meaningful text
             if not selected_text.strip():
                 logging.debug("No text selected, opening chat window directly")
@@ -124,16 +165,21 @@ class HotkeyManager(QObject):
             logging.debug("Creating new popup window")
             self.popup_window = ui.CustomPopupWindow.CustomPopupWindow(self.app, selected_text)
 
-            # Set the window icon
-            icon_path = get_resource_path(os.path.join("icons", "app_icon.png"))
-            if os.path.exists(icon_path):
-                self.app.setWindowIcon(QtGui.QIcon(icon_path))
+            # Set the window icon, resolved once by the app at startup
+            if self.app.app_icon is not None:
+                self.app.setWindowIcon(self.app.app_icon)
+
+            # Size the hidden window from its layout first, so it is positioned once with its final geometry
+            self.popup_window.adjustSize()
 
-            # Position the popup window centered on the cursor
-            cursor_pos = QtGui.QCursor.pos()
+            # Position the popup window centered on the cursor, kept inside the screen the cursor is on
+            cursor_pos, screen = self.app.cursor_and_screen()
             frame_geometry = self.popup_window.frameGeometry()
             frame_geometry.moveCenter(cursor_pos)
-            self.popup_window.move(frame_geometry.topLeft())
+            available = screen.availableGeometry()
+            x = max(available.left(), min(frame_geometry.left(), available.right() - frame_geometry.width() + 1))
+            y = max(available.top(), min(frame_geometry.top(), available.bottom() - frame_geometry.height() + 1))
+            self.popup_window.move(x, y)
 
             logging.debug("Displaying popup window")
             self.popup_window.show()
@@ -141,7 +187,7 @@ class HotkeyManager(QObject):
             self.popup_window.raise_()
 
         except Exception as e:
-            logging.error(f"Error showing popup: {e}")
+            logging.error("Error showing popup: %s", e)
 
     def stop_hotkey_listener(self):
         """Stop the hotkey listener"""
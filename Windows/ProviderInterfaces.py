@@ -8,36 +8,96 @@ It defines the contract that all providers must implement.
 
 import logging
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass
+from typing import List, Protocol
 
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QVBoxLayout
 
+try:
+    import keyring
+    from keyring.errors import KeyringError
+except ImportError:  # Optional, secret settings stay in config.json without it
+    keyring = None
 
-class AIProviderSetting(ABC):
+_KEYRING_SERVICE = "WriteBoost"
+
+
+def _get_secret(name):
     """
-    Abstract base class for a provider setting (e.g., API key, model selection).
+    Return the stored secret for a setting, or None if there is none or no keyring is available.
     """
+    if keyring is None:
+        return None
+    try:
+        return keyring.get_password(_KEYRING_SERVICE, name)
+    except KeyringError as e:
+        logging.warning("Could not read %s from the keyring: %s", name, e)
+        return None
 
-    def __init__(self, name: str, display_name: str = None, default_value: str = None, description: str = None):
-        self.name = name
-        self.display_name = display_name if display_name else name
-        self.default_value = default_value if default_value else ""
-        self.description = description if description else ""
 
-    @abstractmethod
+def _set_secret(name, value):
+    """
+    Store (or, for an empty value, remove) a setting's secret. Returns False if it has to stay in the config.
+    """
+    if keyring is None:
+        return False
+    try:
+        if value:
+            keyring.set_password(_KEYRING_SERVICE, name, value)
+        elif keyring.get_password(_KEYRING_SERVICE, name) is not None:
+            keyring.delete_password(_KEYRING_SERVICE, name)
+        return True
+    except KeyringError as e:
+        logging.warning("Could not store %s in the keyring: %s", name, e)
+        return False
+
+
+# Chat system instruction used when the provider has none configured; shared by the managers' fallbacks
+DEFAULT_CHAT_SYSTEM_INSTRUCTION = (
+    "You are a friendly, helpful, compassionate, and endearing AI conversational assistant. "
+    "Avoid making assumptions or generating harmful, biased, or inappropriate content. "
+    "When in doubt, do not make up information. Ask the user for clarification if needed. "
+    "Try not be unnecessarily repetitive in your response. "
+    "You can, and should as appropriate, use Markdown formatting to make your response nicely readable."
+)
+
+
+class ProviderSetting(Protocol):
+    """
+    Interface every provider setting implements (e.g., API key, model selection).
+    """
+
+    name: str
+    default_value: str
+
     def render_to_layout(self, layout: QVBoxLayout):
         """Render the setting widget(s) into the provided layout."""
-        pass
 
-    @abstractmethod
     def set_value(self, value):
         """Set the internal value from configuration."""
-        pass
 
-    @abstractmethod
     def get_value(self):
         """Return the current value from the widget."""
-        pass
+
+
+@dataclass(eq=False)
+class AIProviderSetting:
+    """
+    Base class holding the fields shared by all provider settings.
+    Subclasses implement the ProviderSetting methods.
+    """
+
+    name: str
+    display_name: str = ""
+    default_value: str = ""
+    description: str = ""
+
+    def __post_init__(self):
+        # Callers may pass None for any optional field
+        self.display_name = self.display_name or self.name
+        self.default_value = self.default_value or ""
+        self.description = self.description or ""
 
 
 class AIProvider(ABC):
@@ -51,11 +111,26 @@ class AIProvider(ABC):
       • cancel() to cancel an ongoing request
     """
 
+    # Subclasses may add their own __slots__ to drop the per-instance __dict__
+    __slots__ = (
+        "provider_name",
+        "settings",
+        "_settings_by_name",
+        "_loaded_config",
+        "app",
+        "description",
+        "logo",
+        "button_text",
+        "button_action",
+        "_save_timer",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         app,
         provider_name: str,
-        settings: List[AIProviderSetting],
+        settings: List[ProviderSetting],
         description: str = "An unfinished AI provider!",
         logo: str = "generic",
         button_text: str = "Go to URL",
@@ -63,12 +138,19 @@ class AIProvider(ABC):
     ):
         self.provider_name = provider_name
         self.settings = settings
+        self._settings_by_name = {setting.name: setting for setting in settings}
+        self._loaded_config = None  # Copy of the config last applied by load_config
         self.app = app
         self.description = description if description else "An unfinished AI provider!"
         self.logo = logo
         self.button_text = button_text
         self.button_action = button_action
 
+        # Coalesces bursts of save_config calls into a single disk write
+        self._save_timer = QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self._write_config)
+
     @abstractmethod
     def get_response(self, system_instruction: str, prompt: str) -> str:
         """
@@ -80,37 +162,63 @@ class AIProvider(ABC):
         """
         Load configuration settings into the provider.
         """
-        logging.debug(f"Loading config for provider: {config}")
+        if config == self._loaded_config:
+            logging.debug("Provider config unchanged, skipping reload")
+            return
+        logging.debug("Loading config for provider: %s", config)
+        # Start every setting from its default...
         for setting in self.settings:
-            if setting.name in config:
-                setattr(self, setting.name, config[setting.name])
-                setting.set_value(config[setting.name])
-                logging.debug(
-                    f"Set {setting.name} to: {'***' + str(config[setting.name])[-4:] if setting.name == 'api_key' else config[setting.name]}"
-                )
-            else:
-                setattr(self, setting.name, setting.default_value)
+            setattr(self, setting.name, setting.default_value)
+            setting.set_value(setting.default_value)
+
+        # ...then override the defaults with whatever the config provides; unknown keys are ignored
+        debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+        for name, value in config.items():
+            setting = self._settings_by_name.get(name)
+            if setting is None:
+                continue
+            setattr(self, name, value)
+            setting.set_value(value)
+            if debug_enabled:
+                logging.debug("Set %s to: %s", name, "***" + str(value)[-4:] if name == "api_key" else value)
+
+        # Secrets saved to the OS keyring win over a value still in the config from before they were moved there
+        for setting in self.settings:
+            if getattr(setting, "secret", False):
+                value = _get_secret(setting.name)
+                if value is not None:
+                    setattr(self, setting.name, value)
+                    setting.set_value(value)
 
         self.after_load()
+        self._loaded_config = dict(config)
 
     def save_config(self):
         """
         Save provider configuration settings into the main config file.
         """
         try:
-            logging.debug(f"=== Provider {self.provider_name} save_config starting ===")
+            logging.debug("=== Provider %s save_config starting ===", self.provider_name)
             
             config = {}
+            debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
             for setting in self.settings:
                 try:
                     value = setting.get_value()
+                    if getattr(setting, "secret", False) and _set_secret(setting.name, value):
+                        logging.debug("Stored %s in the keyring", setting.name)
+                        # The config alone no longer shows whether the secret changed, so force the next reload
+                        self._loaded_config = None
+                        continue
                     config[setting.name] = value
-                    logging.debug(f"Setting {setting.name} = {value}")
+                    if debug_enabled:
+                        name = setting.name
+                        logging.debug("Setting %s = %s", name, "***" + str(value)[-4:] if name == "api_key" else value)
                 except Exception as e:
-                    logging.error(f"Error getting value for setting {setting.name}: {e}")
+                    logging.error("Error getting value for setting %s: %s", setting.name, e)
                     raise
             
-            logging.debug(f"Provider config collected: {config}")
+            logging.debug("Provider config collected: %d settings", len(config))
             
             # Ensure providers section exists in app config
             if self.app.config is None:
@@ -122,18 +230,30 @@ class AIProvider(ABC):
                 self.app.config["providers"] = {}
                 
             self.app.config["providers"][self.provider_name] = config
-            logging.debug(f"Added provider config to app config: {self.app.config}")
+            logging.debug("Added provider config to app config")
             
-            logging.debug("About to call app.save_config...")
-            self.app.save_config(self.app.config)
+            logging.debug("Scheduling app.save_config...")
+            self._save_timer.start(250)
             logging.debug("=== Provider save_config completed successfully ===")
             
         except Exception as e:
-            logging.error(f"ERROR in provider save_config: {e}")
-            import traceback
-            logging.error(f"Traceback: {traceback.format_exc()}")
+            logging.error("ERROR in provider save_config: %s", e, exc_info=True)
             raise
 
+    def flush_config(self):
+        """
+        Write a pending save_config to disk immediately instead of waiting for the debounce timer.
+        """
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._write_config()
+
+    def _write_config(self):
+        """
+        Persist the app config, including this provider's settings, to disk.
+        """
+        self.app.save_config(self.app.config)
+
     @abstractmethod
     def after_load(self):
         """
@@ -150,6 +270,25 @@ class AIProvider(ABC):
         """
         pass
 
+    def render_all(self, layout: QVBoxLayout):
+        """
+        Render every setting into layout, with repaints of the layout's widget deferred until all are added.
+        """
+        parent = layout.parentWidget()
+        if parent is None:
+            # Nothing is shown yet, so there is nothing to defer
+            for setting in self.settings:
+                setting.render_to_layout(layout)
+            return
+
+        parent.setUpdatesEnabled(False)
+        try:
+            for setting in self.settings:
+                setting.render_to_layout(layout)
+        finally:
+            parent.setUpdatesEnabled(True)
+            parent.update()
+
     @abstractmethod
     def get_settings_ui(self, parent) -> QVBoxLayout:
         """
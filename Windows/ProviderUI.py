@@ -5,122 +5,197 @@ Provider UI Components for Writing Tools
 This module contains UI components for provider settings like TextSetting and DropdownSetting.
 """
 
-from PySide6 import QtWidgets
+from dataclasses import dataclass, field
+
+from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtWidgets import QVBoxLayout
+from shiboken6 import isValid
 
 from ProviderInterfaces import AIProviderSetting
 
+# Shared by every setting widget; the settings window applies it once instead of per widget
+SETTING_STYLESHEET = """
+    QLabel#settingLabel {
+        font-size: 14px;
+        color: #ffffff;
+        margin-bottom: 4px;
+    }
+    QLineEdit#settingInput, QComboBox#settingDropdown {
+        font-size: 14px;
+        padding: 8px;
+        background-color: #404040;
+        color: #ffffff;
+        border: 1px solid #606060;
+        border-radius: 4px;
+        margin-bottom: 10px;
+    }
+    QLabel#settingDescription {
+        font-size: 12px;
+        color: #bbbbbb;
+        margin-bottom: 15px;
+    }
+"""
+
+
+def _reuse_widgets(widgets, layout):
+    """
+    Move a setting's previously built widgets into layout, reparenting them from the old settings window.
+    Returns False if they haven't been built yet or Qt has already deleted them.
+    """
+    if not widgets or not all(isValid(widget) for widget in widgets):
+        return False
+    for widget in widgets:
+        layout.addWidget(widget)
+    return True
+
 
+@dataclass(eq=False)
 class TextSetting(AIProviderSetting):
     """
     A text-based setting (for API keys, URLs, etc.).
+    Secret settings are kept in the OS keyring instead of config.json when the keyring package is installed.
     """
 
-    def __init__(self, name: str, display_name: str = None, default_value: str = None, description: str = None):
-        super().__init__(name, display_name, default_value, description)
-        self.internal_value = default_value
-        self.input = None
+    secret: bool = False
+    internal_value: str = field(init=False, repr=False)
+    input: QtWidgets.QLineEdit = field(init=False, repr=False, default=None)
+    # True once the user edits the field and internal_value is stale
+    _dirty: bool = field(init=False, repr=False, default=False)
+    # Widgets built by the first render, reused when the settings window reopens
+    _widgets: tuple = field(init=False, repr=False, default=())
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.internal_value = self.default_value
 
     def render_to_layout(self, layout: QVBoxLayout):
+        if _reuse_widgets(self._widgets, layout):
+            # Drop any unsaved edits from the previous window, as a fresh render would
+            self.input.setText(self.internal_value)
+            self._dirty = False
+            return
+
         # Label
         label = QtWidgets.QLabel(self.display_name)
-        label.setStyleSheet("font-size: 14px; color: #ffffff; margin-bottom: 4px;")
+        label.setObjectName("settingLabel")
         layout.addWidget(label)
 
         # Input field
         self.input = QtWidgets.QLineEdit(self.internal_value)
-        self.input.setStyleSheet("""
-            font-size: 14px;
-            padding: 8px;
-            background-color: #404040;
-            color: #ffffff;
-            border: 1px solid #606060;
-            border-radius: 4px;
-            margin-bottom: 10px;
-        """)
+        self.input.setObjectName("settingInput")
+        self.internal_value = self.input.text()
+        self._dirty = False
+        self.input.textChanged.connect(self._mark_dirty)
         layout.addWidget(self.input)
 
         # Description
         if self.description:
             desc_label = QtWidgets.QLabel(self.description)
-            desc_label.setStyleSheet("font-size: 12px; color: #bbbbbb; margin-bottom: 15px;")
+            desc_label.setObjectName("settingDescription")
             desc_label.setWordWrap(True)
             layout.addWidget(desc_label)
+            self._widgets = (label, self.input, desc_label)
+        else:
+            self._widgets = (label, self.input)
 
     def set_value(self, value):
         self.internal_value = str(value) if value is not None else ""
-        if self.input:
+        if self.input and isValid(self.input):
             self.input.setText(self.internal_value)
+            self._dirty = False
 
     def get_value(self):
-        if self.input:
-            return self.input.text()
+        if self.input and self._dirty and isValid(self.input):
+            self.internal_value = self.input.text()
+            self._dirty = False
         return self.internal_value
 
+    def _mark_dirty(self):
+        self._dirty = True
+
 
+@dataclass(eq=False)
 class DropdownSetting(AIProviderSetting):
     """
     A dropdown/combobox setting for selecting from predefined options.
     """
 
-    def __init__(
-        self,
-        name: str,
-        display_name: str = None,
-        default_value: str = None,
-        description: str = None,
-        options: list = None,
-    ):
-        super().__init__(name, display_name, default_value, description)
-        self.options = options if options else []  # List of (display_text, value) tuples
-        self.internal_value = default_value
-        self.dropdown = None
+    options: list = None  # List of (display_text, value) tuples
+    internal_value: str = field(init=False, repr=False)
+    dropdown: QtWidgets.QComboBox = field(init=False, repr=False, default=None)
+    # True once the user picks another option and internal_value is stale
+    _dirty: bool = field(init=False, repr=False, default=False)
+    # Option value -> combobox index, rebuilt whenever the dropdown is populated
+    _value_to_index: dict = field(init=False, repr=False, default_factory=dict)
+    # Widgets built by the first render, reused when the settings window reopens
+    _widgets: tuple = field(init=False, repr=False, default=())
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.options = self.options or []
+        self.internal_value = self.default_value
 
     def render_to_layout(self, layout: QVBoxLayout):
+        if _reuse_widgets(self._widgets, layout):
+            # Drop any unsaved selection from the previous window, as a fresh render would
+            self.set_value(self.internal_value)
+            return
+
         # Label
         label = QtWidgets.QLabel(self.display_name)
-        label.setStyleSheet("font-size: 14px; color: #ffffff; margin-bottom: 4px;")
+        label.setObjectName("settingLabel")
         layout.addWidget(label)
 
         # Dropdown
         self.dropdown = QtWidgets.QComboBox()
-        self.dropdown.setStyleSheet("""
-            font-size: 14px;
-            padding: 8px;
-            background-color: #404040;
-            color: #ffffff;
-            border: 1px solid #606060;
-            border-radius: 4px;
-            margin-bottom: 10px;
-        """)
-
-        # Populate options
-        for display_text, value in self.options:
-            self.dropdown.addItem(display_text, value)
+        self.dropdown.setObjectName("settingDropdown")
+
+        # Populate options through one prebuilt model instead of an addItem call (and its signals) per option
+        model = QtGui.QStandardItemModel(len(self.options), 1, self.dropdown)
+        self._value_to_index = {}
+        for row, (display_text, value) in enumerate(self.options):
+            item = QtGui.QStandardItem(display_text)
+            item.setData(value, QtCore.Qt.ItemDataRole.UserRole)
+            model.setItem(row, item)
+            self._value_to_index[value] = row
+        self.dropdown.setModel(model)
 
         # Set current value
         if self.internal_value:
-            index = self.dropdown.findData(self.internal_value)
+            index = self._value_to_index.get(self.internal_value, -1)
             if index >= 0:
                 self.dropdown.setCurrentIndex(index)
+        self.internal_value = self.dropdown.currentData()
+        self._dirty = False
+        self.dropdown.currentIndexChanged.connect(self._mark_dirty)
 
         layout.addWidget(self.dropdown)
 
         # Description
         if self.description:
             desc_label = QtWidgets.QLabel(self.description)
-            desc_label.setStyleSheet("font-size: 12px; color: #bbbbbb; margin-bottom: 15px;")
+            desc_label.setObjectName("settingDescription")
             desc_label.setWordWrap(True)
             layout.addWidget(desc_label)
+            self._widgets = (label, self.dropdown, desc_label)
+        else:
+            self._widgets = (label, self.dropdown)
 
     def set_value(self, value):
         self.internal_value = str(value) if value is not None else ""
-        if self.dropdown:
-            index = self.dropdown.findData(self.internal_value)
+        if self.dropdown and isValid(self.dropdown):
+            index = self._value_to_index.get(self.internal_value, -1)
             if index >= 0:
                 self.dropdown.setCurrentIndex(index)
+            # Unknown values leave the selection unchanged, so keep the cache in step with the widget
+            self.internal_value = self.dropdown.currentData()
+            self._dirty = False
 
     def get_value(self):
-        if self.dropdown:
-            return self.dropdown.currentData()
-        return self.internal_value
\ No newline at end of file
+        if self.dropdown and self._dirty and isValid(self.dropdown):
+            self.internal_value = self.dropdown.currentData()
+            self._dirty = False
+        return self.internal_value
+
+    def _mark_dirty(self):
+        self._dirty = True
\ No newline at end of file
@@ -1,26 +1,151 @@
 import logging
-import time
-import threading
+import sys
 
-import pyperclip
-from pynput import keyboard as pykeyboard
 from PySide6 import QtCore
 from PySide6.QtCore import Signal, Slot
+from PySide6.QtGui import QGuiApplication
 from PySide6.QtWidgets import QMessageBox
 
+from ProviderInterfaces import DEFAULT_CHAT_SYSTEM_INSTRUCTION
+
+# Sentinel the model returns when the selected text doesn't suit the requested change
+_ERROR_TEXT = "ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST"
+_CLEAN_ERROR = "".join(_ERROR_TEXT.split())
+
+
+def _cb_text():
+    """
+    Return the current clipboard text. Must be called on the GUI thread.
+    """
+    return QGuiApplication.clipboard().text()
+
+
+def _cb_set(text):
+    """
+    Replace the clipboard contents with text. Must be called on the GUI thread.
+    """
+    QGuiApplication.clipboard().setText(text)
+
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _INPUT_KEYBOARD = 1
+    _KEYEVENTF_KEYUP = 0x0002
+    _VK_CONTROL = 0x11
+    _SCAN_CONTROL = 0x1D
+    _SCAN_CODES = {"c": 0x2E, "v": 0x2F}
+
+    class _MOUSEINPUT(ctypes.Structure):
+        _fields_ = (
+            ("dx", wintypes.LONG),
+            ("dy", wintypes.LONG),
+            ("mouseData", wintypes.DWORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),
+        )
+
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = (
+            ("wVk", wintypes.WORD),
+            ("wScan", wintypes.WORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),
+        )
+
+    class _INPUTUNION(ctypes.Union):
+        # MOUSEINPUT is the largest member, so it sets the size Windows expects for INPUT
+        _fields_ = (("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT))
+
+    class _INPUT(ctypes.Structure):
+        _fields_ = (("type", wintypes.DWORD), ("u", _INPUTUNION))
+
+    def _key_input(vk, scan, flags):
+        return _INPUT(type=_INPUT_KEYBOARD, u=_INPUTUNION(ki=_KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags)))
+
+    def _ctrl_combo_inputs(key):
+        vk = ord(key.upper())
+        scan = _SCAN_CODES[key]
+        return (_INPUT * 4)(
+            _key_input(_VK_CONTROL, _SCAN_CONTROL, 0),
+            _key_input(vk, scan, 0),
+            _key_input(vk, scan, _KEYEVENTF_KEYUP),
+            _key_input(_VK_CONTROL, _SCAN_CONTROL, _KEYEVENTF_KEYUP),
+        )
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _user32.GetClipboardSequenceNumber.restype = wintypes.DWORD
+    _CTRL_COMBO_INPUTS = {key: _ctrl_combo_inputs(key) for key in _SCAN_CODES}
+else:
+    _user32 = None
+
+
+def _clipboard_sequence_number():
+    """
+    Return the Windows clipboard sequence number, which changes on every clipboard write, or None elsewhere.
+    """
+    if _user32 is None:
+        return None
+    return _user32.GetClipboardSequenceNumber()
+
+
+def _press_ctrl_combo(key):
+    """
+    Press and release Ctrl+key (key is "c" or "v") in the focused application.
+    On Windows all four key events go out in a single SendInput batch; elsewhere, or if that fails, pynput is used.
+    """
+    if _user32 is not None:
+        inputs = _CTRL_COMBO_INPUTS[key]
+        if _user32.SendInput(len(inputs), inputs, ctypes.sizeof(_INPUT)) == len(inputs):
+            return
+        logging.warning("SendInput failed (error %d), falling back to pynput", ctypes.get_last_error())
+
+    # Only needed off Windows or when SendInput fails, so pynput is imported on demand
+    from pynput import keyboard as pykeyboard
+
+    kbrd = pykeyboard.Controller()
+    kbrd.press(pykeyboard.Key.ctrl.value)
+    kbrd.press(key)
+    kbrd.release(key)
+    kbrd.release(pykeyboard.Key.ctrl.value)
+
+
+class _ProcessOptionTask(QtCore.QRunnable):
+    """Runs a writing option request on the shared Qt thread pool"""
+
+    def __init__(self, manager, option, selected_text, custom_change):
+        super().__init__()
+        self.manager = manager
+        self.option = option
+        self.selected_text = selected_text
+        self.custom_change = custom_change
+
+    def run(self):
+        self.manager.process_option_thread(self.option, self.selected_text, self.custom_change)
+
 
 class TextOperationsManager(QtCore.QObject):
     """Handles text capture, processing, and replacement operations"""
     
     show_message_signal = Signal(str, str)
+    paste_text_signal = Signal(str)
+    set_text_signal = Signal(str)
 
     def __init__(self, app, parent=None):
         super().__init__(parent)
         self.app = app
-        self.output_queue = ""
-        
+        self.reset_output()
+
         # Connect signals
         self.show_message_signal.connect(self.show_message_box)
+        # replace_text may run on a worker thread and QClipboard is GUI-thread only, so pasting is marshalled there
+        self.paste_text_signal.connect(self._paste_text)
+        self._set_text_slot = None  # set_text of the response window set_text_signal is connected to
+        # Whether the last Ctrl+C in get_selected_text wrote to the clipboard at all (None if unknown)
+        self.last_capture_copied = None
 
     def get_selected_text(self, max_retries=2):
         """
@@ -28,48 +153,41 @@ class TextOperationsManager(QtCore.QObject):
         Args:
             max_retries (int): Maximum number of attempts to capture text
         """
-        clipboard_backup = pyperclip.paste()
+        clipboard_backup = _cb_text()
         
         for attempt in range(max_retries):
-            logging.debug(f"Text capture attempt {attempt + 1}/{max_retries}")
+            logging.debug("Text capture attempt %d/%d", attempt + 1, max_retries)
             
             # Clear the clipboard
             self.clear_clipboard()
+            sequence_before = _clipboard_sequence_number()
 
             # Simulate Ctrl+C
             logging.debug("Simulating Ctrl+C")
-            kbrd = pykeyboard.Controller()
-
-            def press_ctrl_c():
-                kbrd.press(pykeyboard.Key.ctrl.value)
-                kbrd.press("c")
-                kbrd.release("c")
-                kbrd.release(pykeyboard.Key.ctrl.value)
+            _press_ctrl_combo("c")
 
-            press_ctrl_c()
-
-            # Progressive delay: 0.1s first attempt, then 0.3s
-            delay = 0.1 if attempt == 0 else 0.3
-            time.sleep(delay)
-            logging.debug(f"Waited {delay}s for clipboard")
+            # Wait for the copy to land: up to 100ms on the first attempt, then 300ms
+            timeout_ms = 100 if attempt == 0 else 300
+            self.wait_for_clipboard_text(timeout_ms, sequence_before)
+            if sequence_before is not None:
+                self.last_capture_copied = _clipboard_sequence_number() != sequence_before
 
             # Get the selected text
-            selected_text = pyperclip.paste()
-            logging.debug(f"Clipboard content after Ctrl+C: '{selected_text}'")
-            logging.debug(f"Original clipboard backup: '{clipboard_backup}'")
+            selected_text = _cb_text()
+            logging.debug("Clipboard holds %d characters after Ctrl+C", len(selected_text))
             
             # Check if we got meaningful text
             if selected_text and selected_text.strip():
                 # We got some text, assume it's selected text
-                logging.debug(f"Got text from clipboard: '{selected_text}'")
+                logging.debug("Got text from clipboard")
                 # Restore the clipboard and return success
-                pyperclip.copy(clipboard_backup)
+                _cb_set(clipboard_backup)
                 return selected_text
             elif selected_text != clipboard_backup:
                 # We got different text (even if empty), could be valid selection
-                logging.debug(f"Got different text from clipboard: '{selected_text}'")
+                logging.debug("Got different text from clipboard")
                 # Restore the clipboard and return success
-                pyperclip.copy(clipboard_backup)
+                _cb_set(clipboard_backup)
                 return selected_text
                 
             # If last attempt failed, break to avoid unnecessary waiting
@@ -77,29 +195,73 @@ class TextOperationsManager(QtCore.QObject):
                 logging.warning("Failed to capture selected text after all attempts")
 
         # Restore the clipboard before returning empty result
-        pyperclip.copy(clipboard_backup)
+        _cb_set(clipboard_backup)
         return ""
 
+    @staticmethod
+    def wait_for_clipboard_text(timeout_ms, sequence_before=None):
+        """
+        Wait until the clipboard holds text or timeout_ms elapses.
+        Returns as soon as the copy lands instead of sleeping for a fixed delay. The wait runs a nested event loop
+        because clear_clipboard left this process owning the clipboard, and the copying application blocks until
+        the owner answers its clipboard messages. User input is held back until the loop ends; HotkeyManager
+        ignores hotkey presses that arrive while a capture is in progress.
+        sequence_before is the clipboard sequence number from before Ctrl+C, if known; the text is then only
+        read once the clipboard has actually been written.
+        """
+        clipboard = QGuiApplication.clipboard()
+
+        def copied():
+            if sequence_before is not None and _clipboard_sequence_number() == sequence_before:
+                return False
+            return bool(clipboard.text())
+
+        if copied():
+            return
+
+        loop = QtCore.QEventLoop()
+
+        def check():
+            if copied():
+                loop.quit()
+
+        poll = QtCore.QTimer()
+        poll.setInterval(10)
+        poll.timeout.connect(check)
+        deadline = QtCore.QTimer()
+        deadline.setSingleShot(True)
+        deadline.timeout.connect(loop.quit)
+        clipboard.dataChanged.connect(check)
+        try:
+            poll.start()
+            deadline.start(timeout_ms)
+            loop.exec(QtCore.QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents)
+        finally:
+            clipboard.dataChanged.disconnect(check)
+            poll.stop()
+            deadline.stop()
+
     @staticmethod
     def clear_clipboard():
         """
         Clear the system clipboard.
         """
         try:
-            pyperclip.copy("")
+            _cb_set("")
         except Exception as e:
-            logging.error(f"Error clearing clipboard: {e}")
+            logging.error("Error clearing clipboard: %s", e)
 
     def process_option(self, option, selected_text, custom_change=None):
         """
         Process the selected writing option in a separate thread.
         """
-        logging.debug(f"Processing option: {option}")
+        logging.debug("Processing option: %s", option)
 
         # For Summary, Key Points, Table, and empty text custom prompts, create response window
         if (option == "Custom" and not selected_text.strip()) or self.app.options[option]["open_in_window"]:
             window_title = "Chat" if (option == "Custom" and not selected_text.strip()) else option
             self.app.current_response_window = self.app.show_response_window(window_title, selected_text)
+            self._connect_set_text(self.app.current_response_window)
 
             # Initialize chat history with text/prompt
             if option == "Custom" and not selected_text.strip():
@@ -115,67 +277,70 @@ class TextOperationsManager(QtCore.QObject):
             if hasattr(self.app, "current_response_window"):
                 delattr(self.app, "current_response_window")
 
-        threading.Thread(
-            target=self.process_option_thread, args=(option, selected_text, custom_change), daemon=True
-        ).start()
+        QtCore.QThreadPool.globalInstance().start(_ProcessOptionTask(self, option, selected_text, custom_change))
+
+    def _connect_set_text(self, response_window):
+        """
+        Route set_text_signal to the given response window only, dropping the previous window's connection.
+        """
+        if self._set_text_slot is not None:
+            try:
+                self.set_text_signal.disconnect(self._set_text_slot)
+            except (RuntimeError, TypeError):
+                # The previous window has already been deleted
+                pass
+        self._set_text_slot = response_window.set_text
+        self.set_text_signal.connect(self._set_text_slot, QtCore.Qt.ConnectionType.QueuedConnection)
 
     def process_option_thread(self, option, selected_text, custom_change=None):
         """
         Thread function to process the selected writing option using the AI model.
         """
-        logging.debug(f"Starting processing thread for option: {option}")
+        logging.debug("Starting processing thread for option: %s", option)
         try:
             if selected_text.strip() == "":
                 # No selected text
                 if option == "Custom":
                     prompt = custom_change
                     system_instruction = getattr(
-                        self.app.current_provider,
-                        "chat_system_instruction",
-                        "You are a friendly, helpful, compassionate, and endearing AI conversational assistant. Avoid making assumptions or generating harmful, biased, or inappropriate content. When in doubt, do not make up information. Ask the user for clarification if needed. Try not be unnecessarily repetitive in your response. You can, and should as appropriate, use Markdown formatting to make your response nicely readable.",
+                        self.app.current_provider, "chat_system_instruction", DEFAULT_CHAT_SYSTEM_INSTRUCTION
                     )
                 else:
                     self.show_message_signal.emit("Error", "Please select text to use this option.")
                     return
             else:
-                selected_prompt = self.app.options.get(option, ("", ""))
-                prompt_prefix = selected_prompt["prefix"]
-                system_instruction = selected_prompt["instruction"]
+                opt = self.app.options[option]
+                prompt_prefix = opt["prefix"]
+                system_instruction = opt["instruction"]
                 if option == "Custom":
                     prompt = f"{prompt_prefix}Described change: {custom_change}\n\nText: {selected_text}"
                 else:
                     prompt = f"{prompt_prefix}{selected_text}"
 
-            self.output_queue = ""
+            self.reset_output()
 
-            logging.debug(f"Getting response from provider for option: {option}")
+            logging.debug("Getting response from provider for option: %s", option)
 
-            if (option == "Custom" and not selected_text.strip()) or self.app.options[option]["open_in_window"]:
+            if (option == "Custom" and not selected_text.strip()) or opt["open_in_window"]:
                 logging.debug("Getting response for window display")
                 response = self.app.current_provider.get_response(system_instruction, prompt, return_response=True)
-                logging.debug(f"Got response of length: {len(response) if response else 0}")
+                logging.debug("Got response of length: %d", len(response) if response else 0)
 
                 # For custom prompts with no text, add question to chat history
                 if option == "Custom" and not selected_text.strip():
                     self.app.current_response_window.message_manager.add_user_message(custom_change)
 
-                # Set initial response using QMetaObject.invokeMethod to ensure thread safety
+                # Set initial response through a queued signal to ensure thread safety
                 if hasattr(self.app, "current_response_window"):
-                    # noinspection PyTypeChecker
-                    QtCore.QMetaObject.invokeMethod(
-                        self.app.current_response_window,
-                        "set_text",
-                        QtCore.Qt.ConnectionType.QueuedConnection,
-                        QtCore.Q_ARG(str, response),
-                    )
-                    logging.debug("Invoked set_text on response window")
+                    self.set_text_signal.emit(response)
+                    logging.debug("Emitted set_text to response window")
             else:
                 logging.debug("Getting response for direct replacement")
                 self.app.current_provider.get_response(system_instruction, prompt)
                 logging.debug("Response processed")
 
         except Exception as e:
-            logging.error(f"An error occurred: {e}", exc_info=True)
+            logging.error("An error occurred: %s", e, exc_info=True)
 
             if "Resource has been exhausted" in str(e):
                 self.show_message_signal.emit(
@@ -192,58 +357,66 @@ class TextOperationsManager(QtCore.QObject):
         """
         QMessageBox.warning(None, title, message)
 
+    def reset_output(self):
+        """
+        Clear the accumulated output and restart the error message guard.
+        """
+        self.output_queue = ""
+        # Characters of _CLEAN_ERROR matched so far, or -1 once the output has diverged from it
+        self._clean_prefix_len = 0
+
     @Slot(str)
     def replace_text(self, new_text):
         """
         Replaces the text by pasting in the LLM generated text. With "Key Points" and "Summary", invokes a window with the output instead.
         """
-        error_message = "ERROR_TEXT_INCOMPATIBLE_WITH_REQUEST"
-
         # Confirm new_text exists and is a string
         if new_text and isinstance(new_text, str):
             self.output_queue += new_text
-            current_output = self.output_queue.strip()  # Strip whitespace for comparison
-
-            # If the new text is the error message, show a message box
-            if current_output == error_message:
-                self.show_message_signal.emit("Error", "The text is incompatible with the requested change.")
-                return
-
-            # Check if we're building up to the error message (to prevent partial pasting)
-            if len(current_output) <= len(error_message):
-                clean_current = "".join(current_output.split())
-                clean_error = "".join(error_message.split())
-                if clean_current == clean_error[: len(clean_current)]:
+
+            # Only the new chunk is compared, so the guard costs O(len(new_text)) per call
+            if self._clean_prefix_len >= 0:
+                clean_new = "".join(new_text.split())
+                if _CLEAN_ERROR.startswith(clean_new, self._clean_prefix_len):
+                    self._clean_prefix_len += len(clean_new)
+
+                    # If the output is the error message, show a message box
+                    if self._clean_prefix_len == len(_CLEAN_ERROR):
+                        self.show_message_signal.emit("Error", "The text is incompatible with the requested change.")
+
+                    # Still building up to the error message (to prevent partial pasting)
                     return
+                self._clean_prefix_len = -1
 
             logging.debug("Processing output text")
             try:
                 # For Summary and Key Points, show in response window
                 if hasattr(self.app, "current_response_window"):
-                    # Use set_text for initial content, not append_text
-                    self.app.current_response_window.set_text(self.output_queue.rstrip("\n"))
+                    # Queued, since replace_text may run on a worker thread
+                    self.set_text_signal.emit(self.output_queue.rstrip("\n"))
                 else:
                     # For other options, use the original clipboard-based replacement
-                    clipboard_backup = pyperclip.paste()
-                    cleaned_text = self.output_queue.rstrip("\n")
-                    pyperclip.copy(cleaned_text)
-
-                    kbrd = pykeyboard.Controller()
-
-                    def press_ctrl_v():
-                        kbrd.press(pykeyboard.Key.ctrl.value)
-                        kbrd.press("v")
-                        kbrd.release("v")
-                        kbrd.release(pykeyboard.Key.ctrl.value)
-
-                    press_ctrl_v()
-                    time.sleep(0.2)
-                    pyperclip.copy(clipboard_backup)
+                    self.paste_text_signal.emit(self.output_queue.rstrip("\n"))
 
                 if not hasattr(self.app, "current_response_window"):
-                    self.output_queue = ""
+                    self.reset_output()
 
             except Exception as e:
-                logging.error(f"Error processing output: {e}")
+                logging.error("Error processing output: %s", e)
         else:
-            logging.debug("No new text to process")
\ No newline at end of file
+            logging.debug("No new text to process")
+
+    @Slot(str)
+    def _paste_text(self, text):
+        """
+        Paste text into the focused application through the clipboard, then restore the previous contents.
+        """
+        try:
+            clipboard_backup = _cb_text()
+            _cb_set(text)
+
+            _press_ctrl_combo("v")
+            # Give the target application time to read the clipboard before restoring it
+            QtCore.QTimer.singleShot(200, lambda: _cb_set(clipboard_backup))
+        except Exception as e:
+            logging.error("Error processing output: %s", e)
@@ -1,8 +1,8 @@
-import json
+from collections import deque
 import logging
 import os
 import signal
-import sys
+import socket
 import time
 
 from aiprovider import GeminiProvider
@@ -10,16 +10,10 @@ from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtCore import Signal, Slot
 from PySide6.QtGui import QCursor, QGuiApplication
 from PySide6.QtWidgets import QMessageBox
-import ui.CustomPopupWindow
-import ui.OnboardingWindow
-import ui.ResponseWindow
-import ui.SettingsWindow
-import ui.ButtonEditWindow
-import ui.ChatHistoryWindow
 
 from TextOperationsManager import TextOperationsManager
 from HotkeyManager import HotkeyManager
-from ConfigManager import ConfigManager
+from ConfigManager import ConfigManager, write_json
 from ConversationManager import ConversationManager
 from ui.UIUtils import get_resource_path
 
@@ -38,6 +32,11 @@ class WritingToolApp(QtWidgets.QApplication):
         self.current_response_window = None
         logging.debug("Initializing WritingToolApp")
         self.show_message_signal.connect(self.show_message_box)
+
+        # Resolve the app icon once; the popup and tray icon reuse it
+        self._icon_path = get_resource_path(os.path.join("icons", "app_icon.png"))
+        # The app icon as a QIcon, or None if the icon file is missing
+        self.app_icon = QtGui.QIcon(self._icon_path) if os.path.exists(self._icon_path) else None
         
         # Initialize managers
         self.config_manager = ConfigManager(self)
@@ -66,11 +65,12 @@ class WritingToolApp(QtWidgets.QApplication):
         self.last_replace = 0
 
         # Initialize the ctrl+c hotkey listener
-        self.ctrl_c_timer = None
+        self._sigint_notifier = None
         self.setup_ctrl_c_listener()
 
         # Setup available AI providers
         self.providers = [GeminiProvider(self)]
+        self._providers_by_name = {provider.provider_name: provider for provider in self.providers}
 
         if not self.config:
             logging.debug("No config found, showing onboarding")
@@ -82,9 +82,7 @@ class WritingToolApp(QtWidgets.QApplication):
             provider_name = self.config.get("provider", "Gemini")
             logging.debug(f"Provider name from config: {provider_name}")
 
-            self.current_provider = next(
-                (provider for provider in self.providers if provider.provider_name == provider_name), None
-            )
+            self.current_provider = self._providers_by_name.get(provider_name)
             if not self.current_provider:
                 logging.warning(f"Provider {provider_name} not found. Using default provider.")
                 self.current_provider = self.providers[0]
@@ -96,84 +94,40 @@ class WritingToolApp(QtWidgets.QApplication):
             self.create_tray_icon()
             self.hotkey_manager.register_hotkey()
 
-        self.recent_triggers = []  # Track recent hotkey triggers
         self.TRIGGER_WINDOW = 1.5  # Time window in seconds
         self.MAX_TRIGGERS = 3  # Max allowed triggers in window
+        self.recent_triggers = deque(maxlen=self.MAX_TRIGGERS)  # Track recent hotkey triggers
 
     def check_trigger_spam(self):
         """
         Check if hotkey is being triggered too frequently (3+ times in 1.5 seconds).
         Returns True if spam is detected.
         """
-        current_time = time.time()
+        current_time = time.monotonic()
+
+        # Remove old triggers outside the window (oldest first)
+        while self.recent_triggers and current_time - self.recent_triggers[0] > self.TRIGGER_WINDOW:
+            self.recent_triggers.popleft()
 
         # Add current trigger
         self.recent_triggers.append(current_time)
 
-        # Remove old triggers outside the window
-        self.recent_triggers = [t for t in self.recent_triggers if current_time - t <= self.TRIGGER_WINDOW]
-
         # Check if we have too many triggers in the window
         return len(self.recent_triggers) >= self.MAX_TRIGGERS
 
-    def load_config(self):
-        """
-        Load the configuration file.
-        """
-        self.config_path = os.path.join(os.path.dirname(sys.argv[0]), "config.json")
-        logging.debug(f"Loading config from {self.config_path}")
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path) as f:
-                    content = f.read().strip()
-                    if content:
-                        self.config = json.loads(content)
-                        logging.debug("Config loaded successfully")
-                    else:
-                        logging.debug("Config file is empty")
-                        self.config = None
-            except (json.JSONDecodeError, IOError) as e:
-                logging.warning(f"Config file is corrupted or unreadable: {e}")
-                self.config = None
-        else:
-            logging.debug("Config file not found")
-            self.config = None
-
-    def load_options(self):
-        """
-        Load the options file.
-        """
-        self.options_path = get_resource_path("options.json")
-        logging.debug(f"Loading options from {self.options_path}")
-        if os.path.exists(self.options_path):
-            with open(self.options_path) as f:
-                self.options = json.load(f)
-                logging.debug("Options loaded successfully")
-        else:
-            logging.debug("Options file not found")
-            self.options = None
-
     def save_config(self, config):
         """
         Save the configuration file.
         """
         try:
-            # Ensure config_path is set
-            if not hasattr(self, 'config_path') or not self.config_path:
-                self.config_path = os.path.join(os.path.dirname(sys.argv[0]), "config.json")
-                logging.debug(f"Set config_path to: {self.config_path}")
-                
             logging.debug(f"Saving config to: {self.config_path}")
             logging.debug(f"Config content: {config}")
             
-            with open(self.config_path, "w") as f:
-                json.dump(config, f, indent=4)
-                logging.debug("Config saved successfully")
+            write_json(self.config_path, config)
+            logging.debug("Config saved successfully")
             self.config = config
         except Exception as e:
-            logging.error(f"Error saving config: {e}")
-            import traceback
-            logging.error(f"Traceback: {traceback.format_exc()}")
+            logging.error("Error saving config: %s", e, exc_info=True)
             raise
 
     def show_onboarding(self):
@@ -181,140 +135,27 @@ class WritingToolApp(QtWidgets.QApplication):
         Show the onboarding window for first-time users.
         """
         logging.debug("Showing onboarding window")
+        import ui.OnboardingWindow
+
         self.onboarding_window = ui.OnboardingWindow.OnboardingWindow(self)
         self.onboarding_window.close_signal.connect(self.exit_app)
         self.onboarding_window.show()
 
-    def start_hotkey_listener(self):
-        """
-        Create listener for global hotkeys.
-        """
-        orig_shortcut = self.config.get("shortcut", "ctrl+space")
-        # Parse the shortcut string, for example ctrl+alt+h -> <ctrl>+<alt>+h
-        shortcut = "+".join([f"{t}" if len(t) <= 1 else f"<{t}>" for t in orig_shortcut.split("+")])
-        logging.debug(f"Registering global hotkey for shortcut: {shortcut}")
-        try:
-            if self.hotkey_listener is not None:
-                self.hotkey_listener.stop()
-
-            def on_activate():
-                logging.debug("triggered hotkey")
-                self.hotkey_triggered_signal.emit()  # Emit the signal when hotkey is pressed
-
-            # Define the hotkey combination
-            hotkey = pykeyboard.HotKey(pykeyboard.HotKey.parse(shortcut), on_activate)
-            self.registered_hotkey = orig_shortcut
-
-            # Helper function to standardize key event
-            def for_canonical(f):
-                return lambda k: f(self.hotkey_listener.canonical(k))
-
-            # Create a listener and store it as an attribute to stop it later
-            self.hotkey_listener = pykeyboard.Listener(
-                on_press=for_canonical(hotkey.press), on_release=for_canonical(hotkey.release)
-            )
-
-            # Start the listener
-            self.hotkey_listener.start()
-        except Exception as e:
-            logging.error(f"Failed to register hotkey: {e}")
-
     def register_hotkey(self):
         """
         Register the global hotkey for activating Writing Tools.
         """
-        logging.debug("Registering hotkey")
-        self.start_hotkey_listener()
-        logging.debug("Hotkey registered")
+        self.hotkey_manager.register_hotkey()
 
-    def on_hotkey_pressed(self):
+    def cursor_and_screen(self):
         """
-        Handle the hotkey press event.
+        Return the cursor position and the screen it is on, skipping the screen lookup on single-monitor setups.
         """
-        logging.debug("Hotkey pressed")
-
-        # Check for spam triggers
-        if self.check_trigger_spam():
-            logging.warning("Hotkey spam detected - quitting application")
-            self.exit_app()
-            return
-
-        # Original hotkey handling continues...
-        if self.current_provider:
-            logging.debug("Cancelling current provider's request")
-            self.current_provider.cancel()
-            self.output_queue = ""
-
-        # noinspection PyTypeChecker
-        QtCore.QMetaObject.invokeMethod(self, "_show_popup", QtCore.Qt.ConnectionType.QueuedConnection)
-
-    @Slot()
-    def _show_popup(self):
-        """
-        Show the popup window when the hotkey is pressed.
-        """
-        logging.debug("Showing popup window")
-        # First attempt with default sleep
-        selected_text = self.text_operations_manager.get_selected_text()
-
-        # Retry with more attempts if no text captured
-        if not selected_text:
-            logging.debug("No text captured, retrying with more attempts")
-            selected_text = self.text_operations_manager.get_selected_text(max_retries=3)
-
-        logging.debug(f'Selected text: "{selected_text}"')
-        try:
-            # Check if we have any meaningful text
-            if not selected_text.strip():
-                logging.debug("No text selected, opening chat window directly")
-                # Open ResponseWindow directly for chat
-                response_window = ui.ResponseWindow.ResponseWindow(self, "Chat", None)
-                response_window.show()
-                return
-
-            if self.popup_window is not None:
-                logging.debug("Existing popup window found")
-                if self.popup_window.isVisible():
-                    logging.debug("Closing existing visible popup window")
-                    self.popup_window.close()
-                self.popup_window = None
-            logging.debug("Creating new popup window")
-            self.popup_window = ui.CustomPopupWindow.CustomPopupWindow(self, selected_text)
-
-            # Set the window icon
-            icon_path = get_resource_path(os.path.join("icons", "app_icon.png"))
-            if os.path.exists(icon_path):
-                self.setWindowIcon(QtGui.QIcon(icon_path))
-            # Get the screen containing the cursor
-            cursor_pos = QCursor.pos()
-            screen = QGuiApplication.screenAt(cursor_pos)
-            if screen is None:
-                screen = QGuiApplication.primaryScreen()
-            screen_geometry = screen.geometry()
-            logging.debug(f"Cursor is on screen: {screen.name()}")
-            logging.debug(f"Screen geometry: {screen_geometry}")
-            # Show the popup to get its size
-            self.popup_window.show()
-            self.popup_window.adjustSize()
-            # Ensure the popup it's focused, even on lower-end machines
-            self.popup_window.activateWindow()
-            QtCore.QTimer.singleShot(100, self.popup_window.custom_input.setFocus)
-
-            popup_width = self.popup_window.width()
-            popup_height = self.popup_window.height()
-            # Calculate position
-            x = cursor_pos.x()
-            y = cursor_pos.y() + 20  # 20 pixels below cursor
-            # Adjust if the popup would go off the right edge of the screen
-            if x + popup_width > screen_geometry.right():
-                x = screen_geometry.right() - popup_width
-            # Adjust if the popup would go off the bottom edge of the screen
-            if y + popup_height > screen_geometry.bottom():
-                y = cursor_pos.y() - popup_height - 10  # 10 pixels above cursor
-            self.popup_window.move(x, y)
-            logging.debug(f"Popup window moved to position: ({x}, {y})")
-        except Exception as e:
-            logging.error(f"Error showing popup window: {e}", exc_info=True)
+        cursor_pos = QCursor.pos()
+        screens = self.screens()
+        if len(screens) == 1:
+            return cursor_pos, screens[0]
+        return cursor_pos, QGuiApplication.screenAt(cursor_pos) or self.primaryScreen()
 
     def process_option(self, option, selected_text, custom_change=None):
         """
@@ -334,6 +175,8 @@ class WritingToolApp(QtWidgets.QApplication):
         """
         Show the response in a new window instead of pasting it.
         """
+        import ui.ResponseWindow
+
         response_window = ui.ResponseWindow.ResponseWindow(self, f"{option} Result")
         response_window.selected_text = text  # Store the text for regeneration
         response_window.show()
@@ -349,47 +192,55 @@ class WritingToolApp(QtWidgets.QApplication):
             return
 
         logging.debug("Creating system tray icon")
-        icon_path = get_resource_path(os.path.join("icons", "app_icon.png"))
-        if not os.path.exists(icon_path):
-            logging.warning(f"Tray icon not found at {icon_path}")
+        if self.app_icon is None:
+            logging.warning(f"Tray icon not found at {self._icon_path}")
             # Use a default icon if not found
             self.tray_icon = QtWidgets.QSystemTrayIcon(self)
         else:
-            self.tray_icon = QtWidgets.QSystemTrayIcon(QtGui.QIcon(icon_path), self)
+            self.tray_icon = QtWidgets.QSystemTrayIcon(self.app_icon, self)
         # Set the tooltip (hover name) for the tray icon
         self.tray_icon.setToolTip("WritingTools")
         self.tray_menu = QtWidgets.QMenu()
         self.tray_icon.setContextMenu(self.tray_menu)
 
-        self.update_tray_menu()
+        self.build_tray_menu()
         self.tray_icon.show()
         logging.debug("Tray icon displayed")
 
-    def update_tray_menu(self):
+    def build_tray_menu(self):
         """
-        Update the tray menu with all menu items, including pause functionality
-        and proper translations.
+        Create the tray menu items once and connect them; retranslate_tray_menu only updates their text.
         """
-        self.tray_menu.clear()
-
         # Apply dark mode styles using darkdetect
         self.apply_dark_mode_styles(self.tray_menu)
 
         # Settings menu item
-        settings_action = self.tray_menu.addAction("Settings")
-        settings_action.triggered.connect(self.show_settings)
+        self._settings_action = self.tray_menu.addAction("")
+        self._settings_action.triggered.connect(self.show_settings)
 
         # Chat History menu item
-        chat_history_action = self.tray_menu.addAction("Chat History")
-        chat_history_action.triggered.connect(self.show_chat_history)
+        self._chat_history_action = self.tray_menu.addAction("")
+        self._chat_history_action.triggered.connect(self.show_chat_history)
 
         # Edit Buttons menu item
-        edit_buttons_action = self.tray_menu.addAction("Edit Buttons")
-        edit_buttons_action.triggered.connect(self.show_button_edit)
+        self._edit_buttons_action = self.tray_menu.addAction("")
+        self._edit_buttons_action.triggered.connect(self.show_button_edit)
 
         # Exit menu item
-        exit_action = self.tray_menu.addAction("Exit")
-        exit_action.triggered.connect(self.exit_app)
+        self._exit_action = self.tray_menu.addAction("")
+        self._exit_action.triggered.connect(self.exit_app)
+
+        self.retranslate_tray_menu()
+
+    @Slot()
+    def retranslate_tray_menu(self):
+        """
+        Update the tray menu item labels without rebuilding the menu.
+        """
+        self._settings_action.setText("Settings")
+        self._chat_history_action.setText("Chat History")
+        self._edit_buttons_action.setText("Edit Buttons")
+        self._exit_action.setText("Exit")
 
     @staticmethod
     def apply_dark_mode_styles(menu):
@@ -455,17 +306,21 @@ class WritingToolApp(QtWidgets.QApplication):
         if hasattr(self, 'current_response_window') and self.current_response_window:
             self.current_response_window.handle_followup_response(response_text)
 
+    @Slot(bool)
     def show_settings(self, providers_only=False):
         """
         Show the settings window.
         """
         logging.debug("Showing settings window")
+        import ui.SettingsWindow
+
         # Always create a new settings window to handle providers_only correctly
         self.settings_window = ui.SettingsWindow.SettingsWindow(self, providers_only=providers_only)
         self.settings_window.close_signal.connect(self.exit_app)
         self.settings_window.retranslate_ui()
         self.settings_window.show()
 
+    @Slot()
     def show_chat_history(self):
         """
         Show the chat history window.
@@ -475,18 +330,28 @@ class WritingToolApp(QtWidgets.QApplication):
             import ui.ChatHistoryWindow
 
             self.chat_history_window = ui.ChatHistoryWindow.ChatHistoryWindow(self)
-            self.chat_history_window.close_signal.connect(lambda: setattr(self, "chat_history_window", None))
+            self.chat_history_window.close_signal.connect(self._on_chat_history_closed)
             self.chat_history_window.show()
         except Exception as e:
             logging.error(f"Error showing chat history window: {e}")
             self.show_message_signal.emit("Error", f"Failed to open chat history: {e}")
 
+    @Slot()
+    def _on_chat_history_closed(self):
+        """
+        Drop the reference to the chat history window once it closes.
+        """
+        self.chat_history_window = None
+
+    @Slot()
     def show_button_edit(self):
         """
         Show the button edit window.
         """
         logging.debug("Showing button edit window")
         try:
+            import ui.ButtonEditWindow
+
             self.button_edit_window = ui.ButtonEditWindow.ButtonEditWindow(self)
             self.button_edit_window.show()
         except Exception as e:
@@ -498,13 +363,29 @@ class WritingToolApp(QtWidgets.QApplication):
         Listener for Ctrl+C to exit the app.
         """
         signal.signal(signal.SIGINT, lambda signum, frame: self.handle_sigint(signum, frame))
-        # This empty timer is needed to make sure that the sigint handler gets checked inside the main loop:
-        # without it, the sigint handle would trigger only when an event is triggered, either by a hotkey combination
-        # or by another GUI event like spawning a new window. With this we trigger it every 100ms with an empy lambda
-        # so that the signal handler gets checked regularly.
-        self.ctrl_c_timer = QtCore.QTimer()
-        self.ctrl_c_timer.start(100)
-        self.ctrl_c_timer.timeout.connect(lambda: None)
+        # The Python handler only runs once control returns to the interpreter, which doesn't happen while Qt's
+        # event loop is idle. Python writes a byte to the wakeup socket when a signal arrives, and the notifier
+        # wakes the event loop for it, so the handler runs promptly without polling.
+        # A socket pair is used instead of a pipe because set_wakeup_fd only accepts sockets on Windows.
+        self._sigint_rsock, self._sigint_wsock = socket.socketpair()
+        self._sigint_rsock.setblocking(False)
+        self._sigint_wsock.setblocking(False)
+        signal.set_wakeup_fd(self._sigint_wsock.fileno())
+
+        self._sigint_notifier = QtCore.QSocketNotifier(
+            self._sigint_rsock.fileno(), QtCore.QSocketNotifier.Type.Read, self
+        )
+        self._sigint_notifier.activated.connect(self._drain_sigint_socket)
+
+    @Slot()
+    def _drain_sigint_socket(self):
+        """
+        Empty the signal wakeup socket; the Python signal handler itself runs as soon as this slot is entered.
+        """
+        try:
+            self._sigint_rsock.recv(4096)
+        except OSError:
+            pass
 
     def handle_sigint(self, signum, frame):
         """
@@ -513,11 +394,14 @@ class WritingToolApp(QtWidgets.QApplication):
         logging.info("Received SIGINT. Exiting...")
         self.exit_app()
 
+    @Slot()
     def exit_app(self):
         """
         Exit the application.
         """
         logging.debug("Stopping the listener")
         self.hotkey_manager.stop_hotkey_listener()
+        for provider in self.providers:
+            provider.flush_config()
         logging.debug("Exiting application")
         self.quit()
@@ -6,7 +6,7 @@ This module serves as the main entry point for AI providers and maintains backwa
 The actual implementations have been split into separate modules for better organization.
 
 Key Components:
-1. ProviderInterfaces.py - Abstract base classes (AIProvider, AIProviderSetting)
+1. ProviderInterfaces.py - Base classes and interfaces (AIProvider, AIProviderSetting, ProviderSetting)
 2. ProviderUI.py - UI components (TextSetting, DropdownSetting)  
 3. GeminiProvider.py - Gemini API implementation
 
@@ -14,7 +14,7 @@ This file imports and re-exports all components to maintain backward compatibili
 """
 
 # Import all components for backward compatibility
-from ProviderInterfaces import AIProvider, AIProviderSetting
+from ProviderInterfaces import AIProvider, AIProviderSetting, ProviderSetting
 from ProviderUI import TextSetting, DropdownSetting
 from GeminiProvider import GeminiProvider
 
@@ -22,6 +22,7 @@ from GeminiProvider import GeminiProvider
 __all__ = [
     'AIProvider',
     'AIProviderSetting', 
+    'ProviderSetting',
     'TextSetting',
     'DropdownSetting',
     'GeminiProvider'
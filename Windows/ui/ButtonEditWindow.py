@@ -91,8 +91,8 @@ class ButtonEditWindow(QtWidgets.QWidget):
     def load_options():
         options_path = get_resource_path("options.json")
         if os.path.exists(options_path):
-            with open(options_path) as f:
-                data = json.load(f)
+            with open(options_path, "rb") as f:
+                data = json.loads(f.read())
                 logging.debug("Options loaded successfully")
         else:
             logging.debug("Options file not found")
@@ -151,7 +151,7 @@ class ButtonEditWindow(QtWidgets.QWidget):
     def save_options(options):
         options_path = get_resource_path("options.json")
         with open(options_path, "w") as f:
-            json.dump(options, f, indent=2)
+            f.write(json.dumps(options, indent=2))
 
     def build_buttons_list(self):
         """
@@ -55,8 +55,8 @@ class ChatManager:
         """Load all saved chats"""
         try:
             if os.path.exists(self.chats_file):
-                with open(self.chats_file, encoding="utf-8") as f:
-                    chats = json.load(f)
+                with open(self.chats_file, "rb") as f:
+                    chats = json.loads(f.read())
                     # Sort by timestamp, newest first
                     return sorted(chats, key=lambda x: x["timestamp"], reverse=True)
             return []
@@ -84,7 +84,7 @@ class ChatManager:
     def _save_chats(self, chats: List[Dict]):
         """Save chats to file"""
         with open(self.chats_file, "w", encoding="utf-8") as f:
-            json.dump(chats, f, indent=2, ensure_ascii=False)
+            f.write(json.dumps(chats, indent=2, ensure_ascii=False))
 
     def generate_chat_title(self, chat_history: List[Dict]) -> str:
         """Generate a title for a chat based on its content"""
@@ -188,14 +188,13 @@ class CustomPopupWindow(QtWidgets.QWidget):
 
         logging.debug("CustomPopupWindow UI setup complete")
         self.installEventFilter(self)
-        QtCore.QTimer.singleShot(250, lambda: self.custom_input.setFocus())
 
     @staticmethod
     def load_options():
         options_path = get_resource_path("options.json")
         if os.path.exists(options_path):
-            with open(options_path) as f:
-                data = json.load(f)
+            with open(options_path, "rb") as f:
+                data = json.loads(f.read())
                 logging.debug("Options loaded successfully")
         else:
             logging.debug("Options file not found")
@@ -206,7 +205,7 @@ class CustomPopupWindow(QtWidgets.QWidget):
     def save_options(options):
         options_path = get_resource_path("options.json")
         with open(options_path, "w") as f:
-            json.dump(options, f, indent=2)
+            f.write(json.dumps(options, indent=2))
 
     def build_buttons_list(self):
         """
@@ -280,6 +279,11 @@ class CustomPopupWindow(QtWidgets.QWidget):
         self.app.process_option(instruction, self.selected_text)
         self.close()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Focus the input as soon as the window is shown so no early keystrokes are lost
+        self.custom_input.setFocus(QtCore.Qt.ActiveWindowFocusReason)
+
     def eventFilter(self, obj, event):
         # Hide on deactivate
         if event.type() == QtCore.QEvent.WindowDeactivate:
@@ -461,8 +461,8 @@ class ResponseWindow(QtWidgets.QWidget):
     @Slot(str)
     def handle_followup_response(self, response_text):
         """Handle the follow-up response from the AI with improved layout handling"""
+        self.loading_label.setVisible(False)
         if response_text:
-            self.loading_label.setVisible(False)
             text_display = self.chat_area.add_message(response_text)
 
             # Maintain consistent zoom level
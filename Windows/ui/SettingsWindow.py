@@ -1,6 +1,7 @@
 import logging
 
 from aiprovider import AIProvider
+from ProviderUI import SETTING_STYLESHEET
 from PySide6 import QtCore, QtWidgets
 
 from ui.UIUtils import UIUtils
@@ -67,14 +68,17 @@ class SettingsWindow(QtWidgets.QWidget):
         if provider.provider_name not in self.app.config["providers"]:
             self.app.config["providers"][provider.provider_name] = {}
 
-        # Add provider settings
+        # Add provider settings. The layout is attached first so the settings render straight into
+        # their final parent, in one repaint.
+        provider_config = self.app.config["providers"][provider.provider_name]
         for setting in provider.settings:
-            setting.set_value(
-                self.app.config["providers"][provider.provider_name].get(setting.name, setting.default_value)
-            )
-            setting.render_to_layout(self.current_provider_layout)
+            if getattr(setting, "secret", False) and setting.name not in provider_config:
+                # Kept in the OS keyring, and load_config has already given the setting its value
+                continue
+            setting.set_value(provider_config.get(setting.name, setting.default_value))
 
         layout.addLayout(self.current_provider_layout)
+        provider.render_all(self.current_provider_layout)
 
     def init_ui(self):
         """
@@ -86,13 +90,13 @@ class SettingsWindow(QtWidgets.QWidget):
         self.setMinimumWidth(450)
         self.setFixedWidth(450)
 
-        # Dark background
+        # Dark background, plus the provider setting widget styles
         self.setStyleSheet("""
             QWidget {
                 background-color: #2b2b2b;
                 color: #ffffff;
             }
-        """)
+        """ + SETTING_STYLESHEET)
 
         # Set up the main layout without UIUtils background
         main_layout = QtWidgets.QVBoxLayout(self)
@@ -197,7 +201,7 @@ class SettingsWindow(QtWidgets.QWidget):
             logging.debug("Set streaming and provider")
 
             logging.debug("About to call provider.save_config()...")
-            self.app.providers[0].save_config()  # Only Gemini provider - this now saves to disk
+            self.app.providers[0].save_config()  # Only Gemini provider - schedules a debounced save to disk
             logging.debug("Provider.save_config() completed")
 
             self.app.current_provider = self.app.providers[0]  # Only Gemini provider